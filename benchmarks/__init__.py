@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+sys.path.append(str(SRC_DIR))
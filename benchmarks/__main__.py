@@ -0,0 +1,173 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+from multiprocessing import get_context
+from pathlib import Path
+import tempfile
+
+from prettytable import PrettyTable
+from requests_cache import CachedSession
+
+from benchmarks import BENCHMARKS_DIR
+from benchmarks.runner import get_mode_args, run_phase
+from benchmarks.sample import make_sample_corpus
+from constants import SNAPSHOT_INDEX
+import main
+from snapshots import SnapshotWriter
+
+CORPUS_DIR = BENCHMARKS_DIR / 'corpus'
+BASELINE_FILE = BENCHMARKS_DIR / 'baseline.json'
+MODES = ('pep', 'whats-new', 'latest-versions', 'download')
+PHASES = ('cold', 'warm')
+
+CORPUS_NOT_FOUND = (
+    'Не найден корпус страниц {corpus}. '
+    'Запишите его командой `python -m benchmarks record` '
+    'или создайте командой `python -m benchmarks sample`; '
+    'подходит и снимок, записанный парсером с опцией --record'
+)
+CORPUS_RECORDED = 'Записано {count} ответов в {corpus}'
+BASELINE_SAVED = 'Результаты сохранены в {path}'
+RESULTS_HEAD = (
+    'Режим', 'Запуск', 'Секунды', 'Страниц', 'Страниц/с',
+    'Разбор, мс/стр', 'Пик RSS, МБ', 'Изменение'
+)
+
+
+def configure_benchmark_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Замеры производительности парсера на записанных страницах'
+    )
+    parser.add_argument(
+        'command',
+        choices=('run', 'record', 'sample'),
+        help='Запустить замеры, записать корпус страниц из сети '
+        'или создать синтетический корпус без сети'
+    )
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        choices=MODES,
+        default=MODES,
+        help='Режимы парсера для замеров'
+    )
+    parser.add_argument(
+        '--corpus',
+        type=Path,
+        default=CORPUS_DIR,
+        help='Каталог с записанными страницами (снимок сайта, '
+        'как у опции парсера --record)'
+    )
+    parser.add_argument(
+        '--save',
+        type=Path,
+        nargs='?',
+        const=BASELINE_FILE,
+        help='Сохранить результаты в JSON'
+    )
+    parser.add_argument(
+        '--compare',
+        type=Path,
+        nargs='?',
+        const=BASELINE_FILE,
+        help='Сравнить результаты с сохранённым JSON'
+    )
+    return parser
+
+
+def run(cli_args, parser_args):
+    if not (cli_args.corpus / SNAPSHOT_INDEX).exists():
+        raise SystemExit(CORPUS_NOT_FOUND.format(corpus=cli_args.corpus))
+    context = get_context('spawn')
+    results = {}
+    for mode in cli_args.modes:
+        results[mode] = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for phase in PHASES:
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    results[mode][phase] = executor.submit(
+                        run_phase, cli_args.corpus, mode, parser_args,
+                        temp_dir
+                    ).result()
+    return results
+
+
+def record(cli_args, parser_args):
+    writer = SnapshotWriter(cli_args.corpus)
+    session = CachedSession(backend='memory')
+    session.hooks['response'].append(
+        lambda response, *args, **kwargs: writer.add(response.url, response)
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        main.BASE_DIR = Path(temp_dir)
+        for mode in cli_args.modes:
+            results = main.MODE_TO_FUNCTION[mode](
+                session, get_mode_args(mode, parser_args)
+            )
+            if results is not None:
+                for _ in results:
+                    pass
+    save_corpus(writer, cli_args.corpus)
+
+
+def sample(cli_args):
+    writer = SnapshotWriter(cli_args.corpus)
+    make_sample_corpus(writer)
+    save_corpus(writer, cli_args.corpus)
+
+
+def save_corpus(writer, corpus):
+    writer.close()
+    print(CORPUS_RECORDED.format(
+        count=len(writer.index['responses']), corpus=corpus
+    ))
+
+
+def print_results(results, baseline):
+    table = PrettyTable()
+    table.field_names = RESULTS_HEAD
+    table.align = 'l'
+    for mode, phases in results.items():
+        for phase, stats in phases.items():
+            change = ''
+            old = baseline.get(mode, {}).get(phase)
+            if old and old['seconds']:
+                change = f'{stats["seconds"] / old["seconds"] - 1:+.1%}'
+            table.add_row((
+                mode,
+                phase,
+                f'{stats["seconds"]:.3f}',
+                stats['pages'],
+                f'{stats["pages_per_second"]:.1f}',
+                f'{stats["parse_ms_per_page"]:.2f}',
+                f'{stats["peak_rss_mb"]:.1f}',
+                change,
+            ))
+    print(table)
+
+
+def benchmark():
+    logging.basicConfig(level=logging.WARNING)
+    cli_args, parser_args = configure_benchmark_parser().parse_known_args()
+    if cli_args.command == 'record':
+        record(cli_args, parser_args)
+        return
+    if cli_args.command == 'sample':
+        sample(cli_args)
+        return
+    results = run(cli_args, parser_args)
+    baseline = {}
+    if cli_args.compare is not None:
+        with open(cli_args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+    if cli_args.save is not None:
+        with open(cli_args.save, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(BASELINE_SAVED.format(path=cli_args.save))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,99 @@
+from functools import wraps
+from importlib import import_module
+from pathlib import Path
+import resource
+import sys
+import time
+
+from requests_cache import CachedSession
+
+from configs import configure_argument_parser
+from extractors import EXTRACTORS
+import main
+from records_cache import RecordsCache
+from snapshots import SnapshotAdapter
+
+MOCK_PROTOCOLS = ('http://', 'https://')
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+PRELOADED_MODULES = ('bs4', 'lxml.html', 'tqdm')
+
+
+def get_mode_args(mode, parser_args):
+    return configure_argument_parser(main.MODE_TO_FUNCTION.keys()).parse_args(
+        [mode, *(arg for arg in parser_args if arg != '--')]
+    )
+
+
+def count_requests(session, requests):
+    for method in ('get', 'head'):
+        def counted(*args, method=getattr(session, method), **kwargs):
+            requests.append(args[0])
+            return method(*args, **kwargs)
+        setattr(session, method, counted)
+
+
+def time_extractors(parse_times):
+    for extractors in EXTRACTORS.values():
+        for name, extract in extractors.items():
+            @wraps(extract)
+            def timed(text, extract=extract):
+                start = time.perf_counter()
+                try:
+                    return extract(text)
+                finally:
+                    parse_times.append(time.perf_counter() - start)
+            extractors[name] = timed
+
+
+def run_mode(session, mode, cli_args, requests, parse_times):
+    start = time.perf_counter()
+    results = main.MODE_TO_FUNCTION[mode](session, cli_args)
+    if results is not None:
+        for _ in results:
+            pass
+    seconds = time.perf_counter() - start
+    return {
+        'seconds': seconds,
+        'pages': len(requests),
+        'pages_per_second': len(requests) / seconds if seconds else 0,
+        'parse_ms_per_page': (
+            sum(parse_times) * 1000 / len(parse_times) if parse_times else 0
+        ),
+    }
+
+
+def run_phase(corpus, mode, parser_args, temp_dir):
+    """Один запуск режима в отдельном процессе.
+
+    Кеши хранятся на диске в `temp_dir`, поэтому повторный запуск в новом
+    процессе находит их заполненными, а пик RSS процесса относится только
+    к этому запуску. Модули, которые режимы импортируют при первом вызове,
+    загружаются заранее, чтобы время запуска не включало их импорт.
+    С `--processes` разбор идёт в пуле процессов и его время не замеряется:
+    обёртки с таймером нельзя передать в дочерний процесс.
+    """
+    for module in PRELOADED_MODULES:
+        import_module(module)
+    adapter = SnapshotAdapter(corpus)
+    requests = []
+    parse_times = []
+    main.BASE_DIR = Path(temp_dir)
+    mode_args = get_mode_args(mode, parser_args)
+    if mode_args.processes <= 1:
+        time_extractors(parse_times)
+    session = CachedSession(
+        Path(temp_dir) / 'http_cache', backend=mode_args.cache_backend
+    )
+    for protocol in MOCK_PROTOCOLS:
+        session.mount(protocol, adapter)
+    session.records_cache = RecordsCache(Path(temp_dir) / 'records')
+    count_requests(session, requests)
+    try:
+        stats = run_mode(session, mode, mode_args, requests, parse_times)
+    finally:
+        session.records_cache.close()
+    stats['peak_rss_mb'] = (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * MAXRSS_UNIT / 2 ** 20
+    )
+    return stats
@@ -0,0 +1,146 @@
+import io
+import random
+import zipfile
+
+
+MAIN_DOC_URL = 'https://docs.python.org/3/'
+PEP_URL = 'https://peps.python.org/'
+PEP_COUNT = 120
+WHATS_NEW_VERSIONS = range(0, 14)
+ARCHIVE_FORMATS = ('pdf-a4.zip', 'pdf-letter.zip', 'html.zip', 'text.zip')
+ARCHIVE_DATE = (2024, 1, 1, 0, 0, 0)
+STATUSES = (
+    ('SF', 'Final'), ('S', 'Draft'), ('I', 'Active'), ('IA', 'Active'),
+    ('SA', 'Accepted'), ('SR', 'Rejected'), ('SW', 'Withdrawn'),
+    ('SD', 'Deferred'), ('SS', 'Superseded'), ('PF', 'Final'),
+)
+PARAGRAPH = '<p>{text}</p>'
+TEXT = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 12
+HTML_HEADERS = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def make_page(body):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        '<title>Python</title></head><body>'
+        f'{body}{PARAGRAPH.format(text=TEXT) * 20}</body></html>'
+    ).encode('utf-8')
+
+
+def pep_index_page():
+    rows = ''.join(
+        f'<tr class="row-{"even" if number % 2 else "odd"}">'
+        f'<td><abbr title="">{STATUSES[number % len(STATUSES)][0]}</abbr></td>'
+        f'<td><a class="pep reference internal" href="pep-{number:04d}/">'
+        f'{number}</a></td><td>PEP {number} title</td></tr>'
+        for number in range(PEP_COUNT)
+    )
+    return make_page(
+        f'<section><table><tbody>{rows}</tbody></table></section>'
+    )
+
+
+def pep_page(number):
+    status = STATUSES[number % len(STATUSES)][1]
+    links = ''
+    if status == 'Superseded':
+        links += f'<dt>Superseded-By<span>:</span></dt><dd>{number + 1}</dd>'
+    if number % 7 == 0 and number:
+        links += f'<dt>Requires<span>:</span></dt><dd>{number - 1}</dd>'
+    return make_page(
+        f'<h1>PEP {number} – Sample proposal {number}</h1>'
+        '<dl class="rfc2822 field-list simple">'
+        '<dt>Author<span>:</span></dt><dd>Guido van Rossum</dd>'
+        f'<dt>Status<span>:</span></dt><dd><abbr>{status}</abbr></dd>'
+        '<dt>Type<span>:</span></dt><dd>Standards Track</dd>'
+        '<dt>Created<span>:</span></dt><dd>01-Jan-2020</dd>'
+        f'<dt>Python-Version<span>:</span></dt><dd>3.{number % 14}</dd>'
+        f'{links}</dl>'
+    )
+
+
+def whats_new_index_page():
+    items = ''.join(
+        f'<li class="toctree-l1"><a class="reference internal" '
+        f'href="3.{minor}.html">What’s New In Python 3.{minor}</a></li>'
+        for minor in reversed(WHATS_NEW_VERSIONS)
+    )
+    return make_page(
+        '<section id="what-s-new-in-python"><h1>What’s New in Python</h1>'
+        f'<div class="toctree-wrapper compound"><ul>{items}</ul></div>'
+        '</section>'
+    )
+
+
+def whats_new_page(minor):
+    return make_page(
+        f'<section><h1>What’s New In Python 3.{minor}</h1>'
+        '<dl class="field-list simple"><dt>Editor<span>:</span></dt>\n'
+        f'<dd><p>Editor {minor}</p>\n</dd></dl></section>'
+    )
+
+
+def main_page():
+    versions = ''.join(
+        f'<li><a href="https://docs.python.org/3.{minor}/">'
+        f'Python 3.{minor} ({"stable" if minor == 13 else "security-fixes"})'
+        '</a></li>'
+        for minor in reversed(WHATS_NEW_VERSIONS)
+    )
+    return make_page(
+        '<div class="sphinxsidebar"><div class="sphinxsidebarwrapper">'
+        '<ul><li>Download</li></ul>'
+        f'<ul>{versions}<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></div></div>'
+    )
+
+
+def download_page():
+    links = ''.join(
+        f'<tr><td><a class="reference external" '
+        f'href="archives/python-3.13-docs-{archive}">{archive}</a></td></tr>'
+        for archive in ARCHIVE_FORMATS
+    )
+    return make_page(
+        f'<div role="main"><table class="docutils">{links}</table></div>'
+    )
+
+
+def archive(name):
+    buffer = io.BytesIO()
+    generator = random.Random(name)
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as file:
+        file.writestr(
+            zipfile.ZipInfo('docs.txt', ARCHIVE_DATE),
+            ''.join(generator.choice('abcdef \n') for _ in range(20000)),
+            zipfile.ZIP_DEFLATED
+        )
+    return buffer.getvalue()
+
+
+def get_pages():
+    yield PEP_URL, pep_index_page()
+    for number in range(PEP_COUNT):
+        yield f'{PEP_URL}pep-{number:04d}/', pep_page(number)
+    whats_new_url = f'{MAIN_DOC_URL}whatsnew/'
+    yield whats_new_url, whats_new_index_page()
+    for minor in WHATS_NEW_VERSIONS:
+        yield f'{whats_new_url}3.{minor}.html', whats_new_page(minor)
+    yield MAIN_DOC_URL, main_page()
+    yield f'{MAIN_DOC_URL}download.html', download_page()
+
+
+def make_sample_corpus(writer):
+    """Синтетический корпус со структурой страниц docs.python.org и PEP."""
+    for url, body in get_pages():
+        writer.add_body('GET', url, 200, HTML_HEADERS, body)
+    for archive_format in ARCHIVE_FORMATS:
+        url = f'{MAIN_DOC_URL}archives/python-3.13-docs-{archive_format}'
+        body = archive(archive_format)
+        headers = {
+            'Content-Type': 'application/zip',
+            'Content-Length': str(len(body)),
+            'ETag': f'"{archive_format}"',
+        }
+        writer.add_body('HEAD', url, 200, headers, b'')
+        writer.add_body('GET', url, 200, headers, body)
@@ -1,10 +1,26 @@
 import argparse
 import logging
+from pathlib import Path
 from logging.handlers import RotatingFileHandler
 
 from constants import (
-    BASE_DIR, LOG_FORMAT, DT_FORMAT, PRETTY, FILE, LOG_DIR, LOG_FILE
+    BASE_DIR, BS4, CACHE_BACKENDS, CACHE_DIR, CACHE_EXPIRE_AFTER,
+    CACHE_URLS_EXPIRE_AFTER, CONNECT_TIMEOUT, DEFAULT_DOWNLOAD_FORMATS,
+    DOWNLOAD_FORMATS, DT_FORMAT, HOST_RATE, HOST_WORKERS, HTTP_CACHE_NAME,
+    LOG_DIR, LOG_FILE, LOG_FORMAT, LXML, MEMORY, OUTPUT_FORMATS, POOL_HOSTS,
+    PROCESSES, READ_TIMEOUT, RECORDS_CACHE_FILE, RETRIES, SERVE_HOST,
+    SERVE_PORT, SERVE_REFRESH, SQLITE, WORKERS
 )
+from retries import CircuitBreaker
+
+EXPIRE_URL_ERROR = 'Ожидается значение вида ШАБЛОН=СЕКУНДЫ, получено {value}'
+
+
+def parse_expire_url(value):
+    pattern, _, seconds = value.rpartition('=')
+    if not pattern or not seconds.lstrip('-').isdigit():
+        raise argparse.ArgumentTypeError(EXPIRE_URL_ERROR.format(value=value))
+    return pattern, int(seconds)
 
 
 def configure_argument_parser(availible_modes):
@@ -23,9 +39,196 @@ def configure_argument_parser(availible_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY, FILE),
+        choices=OUTPUT_FORMATS,
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=WORKERS,
+        help='Максимум параллельных загрузок страниц'
+    )
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=int,
+        default=PROCESSES,
+        help='Количество процессов для разбора загруженных страниц'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=HOST_RATE,
+        help='Максимум запросов в секунду к одному хосту (0 - без ограничения)'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=RETRIES,
+        help='Количество повторов запроса при ошибках загрузки'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        help='Размер пула соединений к хосту (по умолчанию по --workers)'
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=CONNECT_TIMEOUT,
+        help='Таймаут установки соединения в секундах'
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help='Таймаут ожидания данных от сервера в секундах'
+    )
+    parser.add_argument(
+        '--compression',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Запрашивать сжатые ответы (gzip, deflate)'
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        '--record',
+        type=Path,
+        metavar='DIR',
+        help='Записать загруженные страницы в снимок сайта в каталоге DIR'
+    )
+    snapshot_group.add_argument(
+        '--replay',
+        type=Path,
+        metavar='DIR',
+        help='Отвечать на запросы из снимка сайта в каталоге DIR без сети'
+    )
+    parser.add_argument(
+        '-f',
+        '--formats',
+        nargs='+',
+        choices=DOWNLOAD_FORMATS.keys(),
+        default=DEFAULT_DOWNLOAD_FORMATS,
+        help='Форматы архивов документации для режима download'
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=(BS4, LXML),
+        default=BS4,
+        help='Движок разбора HTML-страниц'
+    )
+    pep_group = parser.add_mutually_exclusive_group()
+    pep_group.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Перепроверять только изменившиеся страницы PEP'
+    )
+    pep_group.add_argument(
+        '--fast',
+        action='store_true',
+        help='Считать статусы PEP по общему списку без загрузки страниц'
+    )
+    parser.add_argument(
+        '--verify',
+        type=int,
+        default=0,
+        help='Количество случайных страниц PEP для проверки в режиме --fast'
+    )
+    parser.add_argument(
+        '--status',
+        nargs='+',
+        help='Статусы PEP для режима pep-details'
+    )
+    parser.add_argument(
+        '--python-version',
+        nargs='+',
+        help='Версии Python для режима pep-details'
+    )
+    graph_group = parser.add_mutually_exclusive_group()
+    graph_group.add_argument(
+        '--superseded-by',
+        type=int,
+        metavar='NUMBER',
+        help='Все PEP, заменённые PEP NUMBER напрямую или через другие PEP, '
+        'для режима pep-graph'
+    )
+    graph_group.add_argument(
+        '--final-chains',
+        action='store_true',
+        help='Цепочки замен PEP, ведущие к PEP со статусом Final, '
+        'для режима pep-graph'
+    )
+    parser.add_argument(
+        '--cache-backend',
+        choices=CACHE_BACKENDS,
+        default=SQLITE,
+        help='Хранилище кеша HTTP-запросов'
+    )
+    parser.add_argument(
+        '--expire-after',
+        type=int,
+        default=CACHE_EXPIRE_AFTER,
+        help='Время жизни кеша в секундах для остальных страниц (-1 - вечно)'
+    )
+    parser.add_argument(
+        '--expire-url',
+        type=parse_expire_url,
+        action='append',
+        default=[],
+        metavar='PATTERN=SECONDS',
+        help='Время жизни кеша для страниц по шаблону URL (можно повторять)'
+    )
+    parser.add_argument(
+        '--revalidate',
+        action='store_true',
+        help='Перепроверять кеш условными запросами (ETag/If-Modified-Since)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Вывести время этапов работы парсера и статистику запросов'
+    )
+    parser.add_argument(
+        '--profile-json',
+        action='store_true',
+        help='Сохранить профиль запуска в JSON рядом с логами'
+    )
+    parser.add_argument(
+        '--host',
+        default=SERVE_HOST,
+        help='Адрес HTTP-сервера для режима serve'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=SERVE_PORT,
+        help='Порт HTTP-сервера для режима serve'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        help='Unix-сокет вместо адреса и порта для режима serve'
+    )
+    parser.add_argument(
+        '--refresh',
+        type=int,
+        default=SERVE_REFRESH,
+        help='Период фонового обновления результатов в режиме serve, с '
+        '(0 - без фонового обновления)'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        type=Path,
+        help='Файл метрик в формате Prometheus для textfile collector'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Порт HTTP-адреса /metrics с метриками на время работы парсера'
+    )
     return parser
 
 
@@ -41,3 +244,73 @@ def configure_logging():
         level=logging.INFO,
         handlers=(rotating_handler, logging.StreamHandler())
     )
+
+
+def get_host_workers(cli_args):
+    return max(1, min(getattr(cli_args, 'workers', WORKERS), HOST_WORKERS))
+
+
+def get_pool_size(cli_args):
+    pool_size = getattr(cli_args, 'pool_size', None)
+    if pool_size:
+        return pool_size
+    return get_host_workers(cli_args)
+
+
+def mount_adapters(session, cli_args):
+    from snapshots import SnapshotAdapter
+    from throttling import ThrottlingAdapter
+    replay = getattr(cli_args, 'replay', None)
+    if replay is not None:
+        adapter = SnapshotAdapter(replay)
+    else:
+        adapter = ThrottlingAdapter(
+            getattr(cli_args, 'rate', HOST_RATE),
+            get_host_workers(cli_args),
+            timeout=(
+                getattr(cli_args, 'connect_timeout', CONNECT_TIMEOUT),
+                getattr(cli_args, 'read_timeout', READ_TIMEOUT)
+            ),
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=get_pool_size(cli_args)
+        )
+    for protocol in ('http://', 'https://'):
+        session.mount(protocol, adapter)
+
+
+def get_urls_expire_after(cli_args):
+    urls_expire_after = dict(getattr(cli_args, 'expire_url', ()))
+    for pattern, expire_after in CACHE_URLS_EXPIRE_AFTER.items():
+        urls_expire_after.setdefault(pattern, expire_after)
+    return urls_expire_after
+
+
+def configure_session(cli_args):
+    import requests_cache
+    from records_cache import RecordsCache
+    from snapshots import SnapshotWriter
+    cache_dir = BASE_DIR / CACHE_DIR
+    cache_dir.mkdir(exist_ok=True)
+    replay = getattr(cli_args, 'replay', None)
+    session = requests_cache.CachedSession(
+        cache_dir / HTTP_CACHE_NAME,
+        backend=MEMORY if replay is not None else cli_args.cache_backend,
+        expire_after=cli_args.expire_after,
+        urls_expire_after=get_urls_expire_after(cli_args),
+        always_revalidate=cli_args.revalidate,
+        stale_if_error=True,
+    )
+    mount_adapters(session, cli_args)
+    if not getattr(cli_args, 'compression', True):
+        session.headers['Accept-Encoding'] = 'identity'
+    session.retries = (
+        0 if replay is not None else getattr(cli_args, 'retries', RETRIES)
+    )
+    session.circuit_breaker = None if replay is not None else CircuitBreaker()
+    record = getattr(cli_args, 'record', None)
+    session.snapshot = None if record is None else SnapshotWriter(record)
+    session.records_cache = RecordsCache(cache_dir / RECORDS_CACHE_FILE)
+    if cli_args.clear_cache:
+        session.cache.clear()
+        session.records_cache.clear()
+    return session
@@ -17,17 +17,91 @@ EXPECTED_STATUS = {
     'W': ('Withdrawn',),
     '': ('Draft', 'Active'),
 }
+AMBIGUOUS_STATUSES = ('',)
 
 BASE_DIR = Path(__file__).parent
 LOG_DIR = 'logs'
 LOG_FILE = 'parser.log'
+PROFILE_FILE = 'profile_{date}.json'
+PROFILE_BUCKETS = (1, 5, 10, 50, 100, 500, 1000)
 RESULTS_DIR = 'results'
 DOWNLOADS_DIR = 'downloads'
+CACHE_DIR = 'cache'
+PEP_INDEX_FILE = 'pep_index.json'
+HTTP_CACHE_NAME = 'http_cache'
+RECORDS_CACHE_FILE = 'records.sqlite'
+RECORDS_CACHE_SIZE = 20000
+RECORDS_CACHE_TIMEOUT = 30
+EXTRACTORS_VERSION = 1
+SNAPSHOT_INDEX = 'index.json'
+SNAPSHOT_BLOBS = 'blobs.bin'
+
+SQLITE = 'sqlite'
+FILESYSTEM = 'filesystem'
+MEMORY = 'memory'
+CACHE_BACKENDS = (SQLITE, FILESYSTEM, MEMORY)
+CACHE_EXPIRE_AFTER = -1
+CACHE_URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': 24 * 60 * 60,
+    'docs.python.org/3/whatsnew/*': 7 * 24 * 60 * 60,
+}
+
+DOWNLOAD_FORMATS = {
+    'pdf-a4': 'pdf-a4.zip',
+    'pdf-letter': 'pdf-letter.zip',
+    'html': 'html.zip',
+    'text': 'text.zip',
+    'epub': '.epub',
+}
+DEFAULT_DOWNLOAD_FORMATS = ('pdf-a4',)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PROCESSES = 1
+HOST_WORKERS = 8
+WORKERS = HOST_WORKERS
+INITIAL_HOST_WORKERS = 2
+HOST_RATE = 10
+AIMD_DECREASE = 0.5
+LATENCY_TOLERANCE = 2
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_RETRIES = 3
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+POOL_HOSTS = 10
+THROTTLE_DELAY = 1
+MAX_RETRY_AFTER = 60
+RETRIES = 3
+RETRY_STATUSES = (500, 502, 504)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+BREAKER_FAILURES = 10
+BREAKER_RESET_AFTER = 60
+
+SERVE = 'serve'
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8080
+SERVE_REFRESH = 10 * 60
+
+BS4 = 'bs4'
+LXML = 'lxml'
 
 PRETTY = 'pretty'
 FILE = 'file'
+JSONL = 'jsonl'
+PARQUET = 'parquet'
+DOT = 'dot'
+OUTPUT_FORMATS = (PRETTY, FILE, JSONL, SQLITE, PARQUET, DOT)
+RESULTS_DATABASE = 'results.sqlite3'
+PARQUET_BATCH_SIZE = 1000
 ALL_VERSIONS = 'All versions'
 WHATS_NEW_HEAD = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
 LATEST_VERSIONS_HEAD = ('Ссылка на документацию', 'Версия', 'Статус')
 PEP_HEAD = ['Статус', 'Количество']
+PEP_DETAILS_HEAD = (
+    'Номер', 'Ссылка', 'Название', 'Статус', 'Тип', 'Тема', 'Создан',
+    'Версия Python', 'Авторы', 'Спонсор', 'Обсуждение', 'Требует', 'Заменяет',
+    'Заменён на', 'Решение', 'История обсуждения'
+)
+PEP_GRAPH_HEAD = ('Источник', 'Связь', 'Цель')
+PEP_SUPERSEDED_HEAD = ('Номер', 'Название', 'Статус')
+PEP_CHAINS_HEAD = ('Цепочка замен', 'Итоговая PEP')
 TOTAL = 'Всего'
@@ -1,2 +1,10 @@
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
+
+
+class HostUnavailableException(ConnectionError):
+    """Вызывается, когда хост недоступен и запросы к нему не выполняются."""
+
+
+class ThrottledException(ConnectionError):
+    """Вызывается, когда хост ограничивает частоту запросов (429/503)."""
@@ -0,0 +1,225 @@
+from functools import lru_cache
+
+from constants import ALL_VERSIONS, BS4, LXML
+from utils import find_element, find_tag, get_tree, make_soup
+
+WHATS_NEW_INDEX_PARSE_ONLY = 'whats_new_index'
+WHATS_NEW_PARSE_ONLY = 'whats_new'
+LATEST_VERSIONS_PARSE_ONLY = 'latest_versions'
+PEP_INDEX_PARSE_ONLY = 'pep_index'
+PEP_DETAILS_PARSE_ONLY = 'pep_details'
+DOWNLOAD_PARSE_ONLY = 'download'
+PEP_PARSE_ONLY = 'pep'
+PARSE_ONLY = {
+    WHATS_NEW_INDEX_PARSE_ONLY: {'id': 'what-s-new-in-python'},
+    WHATS_NEW_PARSE_ONLY: {'name': ['h1', 'dl']},
+    LATEST_VERSIONS_PARSE_ONLY: {
+        'name': 'div', 'attrs': {'class': 'sphinxsidebarwrapper'}
+    },
+    PEP_INDEX_PARSE_ONLY: {
+        'name': 'tr', 'attrs': {'class': ['row-even', 'row-odd']}
+    },
+    PEP_DETAILS_PARSE_ONLY: {'name': ['h1', 'dl']},
+    DOWNLOAD_PARSE_ONLY: {'name': 'div', 'attrs': {'role': 'main'}},
+    PEP_PARSE_ONLY: {
+        'name': 'dl', 'attrs': {'class': 'rfc2822 field-list simple'}
+    },
+}
+
+WHATS_NEW_LINKS_SELECTOR = (
+    '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > a'
+)
+WHATS_NEW_LINKS_XPATH = (
+    '//*[@id="what-s-new-in-python"]'
+    '//div[contains(concat(" ", @class, " "), " toctree-wrapper ")]'
+    '//li[contains(concat(" ", @class, " "), " toctree-l1 ")]/a'
+)
+SIDEBAR_XPATH = (
+    '//div[contains(concat(" ", @class, " "), " sphinxsidebarwrapper ")]'
+)
+PEP_ROWS_XPATH = (
+    '//tr[contains(concat(" ", @class, " "), " row-even ")'
+    ' or contains(concat(" ", @class, " "), " row-odd ")]'
+)
+PEP_TABLE_XPATH = '//dl[@class="rfc2822 field-list simple"]'
+
+
+@lru_cache(maxsize=None)
+def get_parse_only(name):
+    from bs4 import SoupStrainer
+    return SoupStrainer(**PARSE_ONLY[name])
+
+
+def make_strained_soup(text, name):
+    return make_soup(text, parse_only=get_parse_only(name))
+
+
+def bs4_whats_new_links(text):
+    soup = make_strained_soup(text, WHATS_NEW_INDEX_PARSE_ONLY)
+    return [
+        a_tag['href'] for a_tag in soup.select(WHATS_NEW_LINKS_SELECTOR)
+    ]
+
+
+def bs4_whats_new_page(text):
+    soup = make_strained_soup(text, WHATS_NEW_PARSE_ONLY)
+    return (
+        find_tag(soup, 'h1').text,
+        find_tag(soup, 'dl').text.replace('\n', ' ')
+    )
+
+
+def bs4_latest_versions(text):
+    sidebar = find_tag(
+        make_strained_soup(text, LATEST_VERSIONS_PARSE_ONLY),
+        'div',
+        attrs={'class': 'sphinxsidebarwrapper'}
+    )
+    ul = next(
+        (ul for ul in sidebar.find_all('ul') if ALL_VERSIONS in ul.text),
+        None
+    )
+    if ul is None:
+        return None
+    return [(a_tag['href'], a_tag.text) for a_tag in ul.find_all('a')]
+
+
+def bs4_pep_rows(text):
+    rows = []
+    for row in make_strained_soup(text, PEP_INDEX_PARSE_ONLY).find_all(
+        'tr', class_=['row-even', 'row-odd']
+    ):
+        abbr = row.find('abbr')
+        link = row.find('a', class_='pep reference internal')
+        if abbr and link:
+            rows.append((abbr.text, link.get('href', '')))
+    return rows
+
+
+def bs4_pep_status(text):
+    table = make_strained_soup(text, PEP_PARSE_ONLY).find(
+        'dl', attrs={'class': 'rfc2822 field-list simple'}
+    )
+    if not table:
+        return None
+    for dt in table.find_all('dt'):
+        if 'Status' in dt.text:
+            return dt.find_next_sibling('dd').text.strip()
+    return ''
+
+
+def get_pep_field(name, value):
+    return name.strip().rstrip(':').strip(), ' '.join(value.split())
+
+
+def bs4_pep_details(text):
+    soup = make_strained_soup(text, PEP_DETAILS_PARSE_ONLY)
+    table = soup.find('dl', attrs={'class': 'rfc2822 field-list simple'})
+    if not table:
+        return None
+    h1 = soup.find('h1')
+    details = {'Title': '' if h1 is None else ' '.join(h1.text.split())}
+    for dt in table.find_all('dt'):
+        dd = dt.find_next_sibling('dd')
+        if dd is not None:
+            name, value = get_pep_field(dt.text, dd.text)
+            details[name] = value
+    return details
+
+
+def lxml_whats_new_links(text):
+    return [
+        a_tag.get('href') for a_tag in get_tree(text).xpath(
+            WHATS_NEW_LINKS_XPATH
+        )
+    ]
+
+
+def lxml_whats_new_page(text):
+    tree = get_tree(text)
+    return (
+        find_element(tree, '//h1', 'h1').text_content(),
+        find_element(tree, '//dl', 'dl').text_content().replace('\n', ' ')
+    )
+
+
+def lxml_latest_versions(text):
+    sidebar = find_element(
+        get_tree(text),
+        SIDEBAR_XPATH,
+        'div',
+        attrs={'class': 'sphinxsidebarwrapper'}
+    )
+    ul = next(
+        (
+            ul for ul in sidebar.iterdescendants('ul')
+            if ALL_VERSIONS in ul.text_content()
+        ),
+        None
+    )
+    if ul is None:
+        return None
+    return [
+        (a_tag.get('href'), a_tag.text_content())
+        for a_tag in ul.iterdescendants('a')
+    ]
+
+
+def lxml_pep_rows(text):
+    rows = []
+    for row in get_tree(text).xpath(PEP_ROWS_XPATH):
+        abbr = row.find('.//abbr')
+        link = row.find('.//a[@class="pep reference internal"]')
+        if abbr is not None and link is not None:
+            rows.append((abbr.text_content(), link.get('href', '')))
+    return rows
+
+
+def lxml_pep_status(text):
+    tables = get_tree(text).xpath(PEP_TABLE_XPATH)
+    if not tables:
+        return None
+    for dt in tables[0].iter('dt'):
+        if 'Status' in dt.text_content():
+            dd = dt.xpath('following-sibling::dd[1]')
+            return dd[0].text_content().strip()
+    return ''
+
+
+def lxml_pep_details(text):
+    tree = get_tree(text)
+    tables = tree.xpath(PEP_TABLE_XPATH)
+    if not tables:
+        return None
+    h1 = tree.find('.//h1')
+    details = {
+        'Title': '' if h1 is None else ' '.join(h1.text_content().split())
+    }
+    for dt in tables[0].iter('dt'):
+        dd = dt.xpath('following-sibling::dd[1]')
+        if dd:
+            name, value = get_pep_field(
+                dt.text_content(), dd[0].text_content()
+            )
+            details[name] = value
+    return details
+
+
+EXTRACTORS = {
+    BS4: {
+        'whats_new_links': bs4_whats_new_links,
+        'whats_new_page': bs4_whats_new_page,
+        'latest_versions': bs4_latest_versions,
+        'pep_rows': bs4_pep_rows,
+        'pep_status': bs4_pep_status,
+        'pep_details': bs4_pep_details,
+    },
+    LXML: {
+        'whats_new_links': lxml_whats_new_links,
+        'whats_new_page': lxml_whats_new_page,
+        'latest_versions': lxml_latest_versions,
+        'pep_rows': lxml_pep_rows,
+        'pep_status': lxml_pep_status,
+        'pep_details': lxml_pep_details,
+    },
+}
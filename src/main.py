@@ -1,139 +1,365 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
 from urllib.parse import urljoin
+import random
 import re
-
-import requests_cache
-from tqdm import tqdm
+import time
 
 from constants import (
-    ALL_VERSIONS, BASE_DIR, DOWNLOADS_DIR, MAIN_DOC_URL, EXPECTED_STATUS,
-    LATEST_VERSIONS_HEAD, PEP_HEAD, PEP_URL, TOTAL, WHATS_NEW_HEAD
+    ALL_VERSIONS, AMBIGUOUS_STATUSES, BASE_DIR, BS4, CACHE_DIR,
+    DEFAULT_DOWNLOAD_FORMATS, DOWNLOAD_FORMATS, DOWNLOADS_DIR, MAIN_DOC_URL,
+    EXPECTED_STATUS, LATEST_VERSIONS_HEAD, LOG_DIR, PEP_CHAINS_HEAD,
+    PEP_DETAILS_HEAD, PEP_GRAPH_HEAD, PEP_HEAD, PEP_INDEX_FILE,
+    PEP_SUPERSEDED_HEAD, PEP_URL, PROCESSES, PROFILE_FILE, SERVE, TOTAL,
+    WHATS_NEW_HEAD, WORKERS
+)
+from configs import (
+    configure_argument_parser, configure_logging, configure_session
+)
+from metrics import Metrics
+from outputs import control_output, get_run_id
+from pep_index import (
+    get_conditional_headers, get_pep_number, get_validators, is_unchanged,
+    load_pep_index, save_pep_index
+)
+from pep_graph import PepGraph
+from pep_records import PepRecord, PepStore
+from profiler import MODE, OUTPUT, PROFILER
+from utils import (
+    check_archive, download_file, extract_pages, get_page, get_pages, get_soup
 )
-from configs import configure_argument_parser, configure_logging
-from outputs import control_output
-from utils import get_soup, find_tag
 
 ERROR_MESSAGE = 'Не найден элемент {element}'
 SUCCESS_DOWNLOAD = 'Архив был загружен и сохранён: {path}'
+ARCHIVE_IS_ACTUAL = 'Архив уже загружен и не изменился: {path}'
+ARCHIVE_IS_BROKEN = 'Архив повреждён и был удалён: {path}'
+DOWNLOAD_SPEED = (
+    'Загружено {size:.2f} МБ за {duration:.2f} с ({speed:.2f} МБ/с)'
+)
 PARSER_START = 'Парсер запущен!'
 PARSER_FINISH = 'Парсер завершил работу.'
 PARSER_ARGS = 'Аргументы командной строки: {args}'
 PARSER_ERROR = 'Произошла ошибка в работе парсера: {e}'
 URL_NOT_FOUND = 'Не найден url: {url}, произошла ошибка: {e}'
+STATUS_MISMATCH = (
+    'Статус PEP {url} в списке ({listing}) '
+    'не совпадает со статусом на странице ({page})'
+)
+PEP_INDEX_UPDATED = (
+    'Индекс PEP обновлён: разобрано {changed} из {total} страниц'
+)
+PROFILE_SAVED = 'Профиль запуска сохранён: {file_path}'
+SNAPSHOT_DOWNLOAD = (
+    'Режим download не поддерживает --record и --replay: '
+    'архивы документации не сохраняются в снимок сайта'
+)
+
 
+def get_extractors(cli_args):
+    from extractors import EXTRACTORS
+    return EXTRACTORS[getattr(cli_args, 'engine', BS4)]
 
-def whats_new(session):
+
+def progress(results, total):
+    from tqdm import tqdm
+    return tqdm(results, total=total)
+
+
+def whats_new(session, cli_args=None):
+    extractors = get_extractors(cli_args)
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    results = [WHATS_NEW_HEAD]
-    errors = []
-    for a_tag in tqdm(
-        get_soup(session, whats_new_url).select(
-            '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > a'
+    version_links = [
+        urljoin(whats_new_url, href) for href in get_page(
+            session, whats_new_url, extractors['whats_new_links']
         )
+    ]
+    remaining = Counter(version_links)
+    yield WHATS_NEW_HEAD
+    pages = {}
+    position = 0
+    errors = []
+    for version_link, page, error in progress(
+        extract_pages(
+            session,
+            list(remaining),
+            extractors['whats_new_page'],
+            workers=getattr(cli_args, 'workers', WORKERS),
+            processes=getattr(cli_args, 'processes', PROCESSES)
+        ),
+        total=len(remaining)
     ):
-        href = a_tag['href']
-        version_link = urljoin(whats_new_url, href)
-        try:
-            soup = get_soup(session, version_link)
-            results.append((
-                version_link,
-                find_tag(soup, 'h1').text,
-                find_tag(soup, 'dl').text.replace('\n', ' ')
-            ))
-        except ConnectionError as e:
-            errors.append(URL_NOT_FOUND.format(e=e))
+        if error is not None:
+            errors.append(URL_NOT_FOUND.format(url=version_link, e=error))
+            pages[version_link] = None
+        else:
+            pages[version_link] = (version_link, *page)
+        while (
+            position < len(version_links)
+            and version_links[position] in pages
+        ):
+            link = version_links[position]
+            position += 1
+            remaining[link] -= 1
+            row = pages[link] if remaining[link] else pages.pop(link)
+            if row is not None:
+                yield row
     if errors:
         logging.error('\n'.join(errors))
-    return results
 
 
-def latest_versions(session):
-    soup = get_soup(session, MAIN_DOC_URL)
-    sidebar = find_tag(soup, 'div', attrs={'class': 'sphinxsidebarwrapper'})
-    ul_tags = sidebar.find_all('ul')
-    ul = next((ul for ul in ul_tags if ALL_VERSIONS in ul.text), None)
-    if ul is None:
+def latest_versions(session, cli_args=None):
+    links = get_page(
+        session,
+        MAIN_DOC_URL,
+        get_extractors(cli_args)['latest_versions']
+    )
+    if links is None:
         raise AttributeError(ERROR_MESSAGE.format(element=ALL_VERSIONS))
-    a_tags = ul.find_all('a')
-    if not a_tags:
+    if not links:
         raise ValueError(ERROR_MESSAGE.format(element='a'))
-    results = [LATEST_VERSIONS_HEAD]
+    yield LATEST_VERSIONS_HEAD
     pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
-    for a_tag in a_tags:
-        text_match = re.search(pattern, a_tag.text)
+    for href, text in links:
+        text_match = re.search(pattern, text)
         if text_match is not None:
             version, status = text_match.groups()
         else:
-            version, status = a_tag.text, ''
-        results.append(
-            (a_tag['href'], version, status)
-        )
-    return results
+            version, status = text, ''
+        yield href, version, status
+
 
+def download_archive(session, downloads_dir, archive_url):
+    archive_path = downloads_dir / archive_url.split('/')[-1]
+    if not download_file(session, archive_url, archive_path):
+        logging.info(ARCHIVE_IS_ACTUAL.format(path=archive_path))
+        return 0
+    if not check_archive(archive_path):
+        archive_path.unlink()
+        logging.error(ARCHIVE_IS_BROKEN.format(path=archive_path))
+        return 0
+    logging.info(SUCCESS_DOWNLOAD.format(path=archive_path))
+    return archive_path.stat().st_size
 
-def download(session):
+
+def download(session, cli_args=None):
+    from extractors import DOWNLOAD_PARSE_ONLY, get_parse_only
     downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
-    soup = get_soup(session, downloads_url)
-    archive_url = urljoin(
-        downloads_url,
-        soup.select_one(
-            'div[role=main] table.docutils a[href$="pdf-a4.zip"]'
-        )['href']
+    soup = get_soup(
+        session, downloads_url, parse_only=get_parse_only(DOWNLOAD_PARSE_ONLY)
     )
-    filename = archive_url.split('/')[-1]
+    archive_urls = []
+    for archive_format in getattr(
+        cli_args, 'formats', DEFAULT_DOWNLOAD_FORMATS
+    ):
+        a_tag = soup.select_one(
+            'div[role=main] table.docutils '
+            f'a[href$="{DOWNLOAD_FORMATS[archive_format]}"]'
+        )
+        if a_tag is None:
+            logging.error(ERROR_MESSAGE.format(element=archive_format))
+            continue
+        archive_urls.append(urljoin(downloads_url, a_tag['href']))
     downloads_dir = BASE_DIR / DOWNLOADS_DIR
     downloads_dir.mkdir(exist_ok=True)
-    archive_path = downloads_dir / filename
-    response = session.get(archive_url)
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-    logging.info(SUCCESS_DOWNLOAD.format(path=archive_path))
+    start = time.monotonic()
+    with ThreadPoolExecutor(
+        max_workers=getattr(cli_args, 'workers', WORKERS)
+    ) as executor:
+        size = sum(executor.map(
+            partial(download_archive, session, downloads_dir), archive_urls
+        ))
+    duration = time.monotonic() - start
+    logging.info(DOWNLOAD_SPEED.format(
+        size=size / 2 ** 20,
+        duration=duration,
+        speed=size / 2 ** 20 / duration if duration else 0
+    ))
 
 
-def pep(session):
-    soup = get_soup(session, PEP_URL)
-    rows = soup.find_all('tr', class_=['row-even', 'row-odd'])
-    results = defaultdict(int)
+def get_pep_pages(
+    session, urls, extract, workers=WORKERS, processes=PROCESSES
+):
+    pages = {}
     errors = []
-    for row in tqdm(rows):
-        abbr = row.find('abbr')
-        link = row.find('a', class_='pep reference internal')
-        if not abbr or not link:
+    for url, page, error in progress(
+        extract_pages(session, urls, extract, workers, processes),
+        total=len(urls)
+    ):
+        if error is not None:
+            errors.append(URL_NOT_FOUND.format(url=url, e=error))
             continue
-        status = abbr.text.strip()[1:]
-        url = urljoin(PEP_URL, link.get('href', ''))
-        try:
-            pep_soup = get_soup(session, url)
-        except ConnectionError as e:
-            errors.append(URL_NOT_FOUND.format(url=url, e=e))
+        if page is not None:
+            pages[url] = page
+    if errors:
+        logging.error('\n'.join(errors))
+    return pages
+
+
+def update_pep_index(session, listing, extract, workers=WORKERS):
+    index_path = BASE_DIR / CACHE_DIR / PEP_INDEX_FILE
+    index = load_pep_index(index_path)
+    listing_statuses = {url: status for status, url in listing}
+    headers = {}
+    for url, status in listing_statuses.items():
+        entry = index.get(get_pep_number(url))
+        if entry is not None and entry['listing'] == status:
+            headers[url] = get_conditional_headers(entry)
+    changed = 0
+    errors = []
+    for url, response, error in progress(
+        get_pages(
+            session, list(listing_statuses), workers=workers, headers=headers
+        ),
+        total=len(listing_statuses)
+    ):
+        if error is not None:
+            errors.append(URL_NOT_FOUND.format(url=url, e=error))
             continue
-        table = pep_soup.find('dl', attrs={
-            'class': 'rfc2822 field-list simple'
-        })
-        if not table:
+        number = get_pep_number(url)
+        if url in headers and is_unchanged(index[number], response):
             continue
-        for dt in table.find_all('dt'):
-            if 'Status' in dt.text:
-                status_tag = dt.find_next_sibling(
-                    'dd'
-                ).text.strip()
-                status_from_table = status_tag
-                break
-        if status_from_table:
-            status = status_from_table
-        status = next((
-            key for key, statuses in EXPECTED_STATUS.items()
-            if status in statuses
-        ), status)
-        results[status] += 1
+        changed += 1
+        index[number] = {
+            'listing': listing_statuses[url],
+            'status': extract(response.text),
+            **get_validators(response),
+        }
+    save_pep_index(index, index_path)
     if errors:
         logging.error('\n'.join(errors))
-    return [
-        PEP_HEAD,
-        *results.items(),
-        (TOTAL, sum(results.values())),
+    logging.info(PEP_INDEX_UPDATED.format(
+        changed=changed, total=len(listing_statuses)
+    ))
+    return {
+        url: index[get_pep_number(url)]['status']
+        for url in listing_statuses
+        if index.get(get_pep_number(url), {}).get('status') is not None
+    }
+
+
+def get_status_key(status):
+    return next((
+        key for key, statuses in EXPECTED_STATUS.items()
+        if status in statuses
+    ), status)
+
+
+def get_fast_pep_statuses(
+    session, listing, extract, workers=WORKERS, processes=PROCESSES, verify=0
+):
+    listing_statuses = {url: status for status, url in listing}
+    ambiguous = [
+        url for url, status in listing_statuses.items()
+        if status in AMBIGUOUS_STATUSES
     ]
+    unambiguous = [url for url in listing_statuses if url not in ambiguous]
+    sample = random.sample(unambiguous, min(verify, len(unambiguous)))
+    page_statuses = get_pep_pages(
+        session, ambiguous + sample, extract, workers, processes
+    )
+    for url in sample:
+        page_status = page_statuses.get(url)
+        if page_status and (
+            get_status_key(page_status) != listing_statuses[url]
+        ):
+            logging.warning(STATUS_MISMATCH.format(
+                url=url, listing=listing_statuses[url], page=page_status
+            ))
+    return {**dict.fromkeys(unambiguous, ''), **page_statuses}
+
+
+def pep(session, cli_args=None):
+    extractors = get_extractors(cli_args)
+    listing = [
+        (abbr.strip()[1:], urljoin(PEP_URL, href))
+        for abbr, href in get_page(session, PEP_URL, extractors['pep_rows'])
+    ]
+    workers = getattr(cli_args, 'workers', WORKERS)
+    processes = getattr(cli_args, 'processes', PROCESSES)
+    if getattr(cli_args, 'fast', False):
+        page_statuses = get_fast_pep_statuses(
+            session,
+            listing,
+            extractors['pep_status'],
+            workers,
+            processes,
+            getattr(cli_args, 'verify', 0)
+        )
+    elif getattr(cli_args, 'incremental', False):
+        page_statuses = update_pep_index(
+            session, listing, extractors['pep_status'], workers
+        )
+    else:
+        page_statuses = get_pep_pages(
+            session,
+            list(dict.fromkeys(url for _, url in listing)),
+            extractors['pep_status'],
+            workers,
+            processes
+        )
+    results = defaultdict(int)
+    for status, url in listing:
+        if url not in page_statuses:
+            continue
+        results[get_status_key(page_statuses[url] or status)] += 1
+    yield PEP_HEAD
+    yield from results.items()
+    yield TOTAL, sum(results.values())
+
+
+def get_pep_store(session, cli_args=None):
+    extractors = get_extractors(cli_args)
+    urls = list(dict.fromkeys(
+        urljoin(PEP_URL, href)
+        for _, href in get_page(session, PEP_URL, extractors['pep_rows'])
+    ))
+    store = PepStore()
+    for url, details in get_pep_pages(
+        session,
+        urls,
+        extractors['pep_details'],
+        getattr(cli_args, 'workers', WORKERS),
+        getattr(cli_args, 'processes', PROCESSES)
+    ).items():
+        store.add(PepRecord.from_details(url, details))
+    return store
+
+
+def pep_details(session, cli_args=None):
+    store = get_pep_store(session, cli_args)
+    yield PEP_DETAILS_HEAD
+    for record in store.filter(
+        status=getattr(cli_args, 'status', None),
+        python_version=getattr(cli_args, 'python_version', None)
+    ):
+        yield record.as_row()
+
+
+def get_superseded_rows(graph, number):
+    for superseded in graph.get_superseded(number):
+        record = graph.records.get(superseded)
+        yield (
+            superseded,
+            '' if record is None else record.title,
+            '' if record is None else record.status
+        )
+
+
+def pep_graph(session, cli_args=None):
+    graph = PepGraph(get_pep_store(session, cli_args).records)
+    superseded_by = getattr(cli_args, 'superseded_by', None)
+    if superseded_by is not None:
+        yield PEP_SUPERSEDED_HEAD
+        yield from get_superseded_rows(graph, superseded_by)
+    elif getattr(cli_args, 'final_chains', False):
+        yield PEP_CHAINS_HEAD
+        for chain in graph.get_final_chains():
+            yield ' -> '.join(map(str, chain)), chain[-1]
+    else:
+        yield PEP_GRAPH_HEAD
+        yield from graph.edges
 
 
 MODE_TO_FUNCTION = {
@@ -141,26 +367,74 @@ MODE_TO_FUNCTION = {
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'pep-details': pep_details,
+    'pep-graph': pep_graph,
 }
 
 
+def report_profile(cli_args):
+    if cli_args.profile:
+        PROFILER.print_report()
+    if cli_args.profile_json:
+        file_path = BASE_DIR / LOG_DIR / PROFILE_FILE.format(date=get_run_id())
+        PROFILER.save_report(file_path)
+        logging.info(PROFILE_SAVED.format(file_path=file_path))
+
+
+def run_parser(args, metrics):
+    session = configure_session(args)
+    try:
+        if args.mode == SERVE:
+            from server import serve
+            serve(session, args, {
+                mode: function for mode, function in MODE_TO_FUNCTION.items()
+                if mode != 'download'
+            })
+        else:
+            run_mode(session, args, metrics)
+    finally:
+        session.records_cache.close()
+        if session.snapshot is not None:
+            session.snapshot.close()
+    report_profile(args)
+
+
+def run_mode(session, args, metrics):
+    from inspect import isgeneratorfunction
+    mode = MODE_TO_FUNCTION[args.mode]
+    if not isgeneratorfunction(mode):
+        PROFILER.timed(MODE)(mode)(session, args)
+        return
+    with PROFILER.timer(OUTPUT):
+        control_output(
+            metrics.collect(PROFILER.timed_iter(MODE, mode(session, args))),
+            args
+        )
+
+
 def main():
+    metrics = None
     try:
+        arg_parser = configure_argument_parser((*MODE_TO_FUNCTION, SERVE))
+        args = arg_parser.parse_args()
+        if args.mode == 'download' and (args.record or args.replay):
+            arg_parser.error(SNAPSHOT_DOWNLOAD)
         configure_logging()
         logging.info(PARSER_START)
-        arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
-        args = arg_parser.parse_args()
         logging.info(PARSER_ARGS.format(args=args))
-        session = requests_cache.CachedSession()
-        if args.clear_cache:
-            session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
+        metrics = Metrics(args.mode, args.metrics_file, args.metrics_port)
+        PROFILER.enabled = (
+            args.profile or args.profile_json or metrics.enabled
+        )
+        metrics.start()
+        run_parser(args, metrics)
+        metrics.success = True
         logging.info(PARSER_FINISH)
     except Exception as e:
         logging.exception(PARSER_ERROR.format(e=e))
+    finally:
+        if metrics is not None:
+            metrics.finish()
 
 
 if __name__ == '__main__':
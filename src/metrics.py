@@ -0,0 +1,174 @@
+import os
+from threading import Thread
+import time
+
+from constants import TOTAL
+from profiler import BYTES, CACHE_HITS, FAILURES, PROFILER, REQUESTS
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_HOST = '127.0.0.1'
+METRICS_PATH = '/metrics'
+METRIC = '# HELP {name} {help}\n# TYPE {name} gauge\n'
+SAMPLE = '{name}{{{labels}}} {value}\n'
+
+
+def escape_label(value):
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def render_metric(name, help, samples):
+    lines = [METRIC.format(name=name, help=help)]
+    for labels, value in samples:
+        lines.append(SAMPLE.format(
+            name=name,
+            labels=','.join(
+                f'{label}="{escape_label(label_value)}"'
+                for label, label_value in labels.items()
+            ),
+            value=value
+        ))
+    return ''.join(lines)
+
+
+class Metrics:
+    """Метрики запуска парсера в текстовом формате Prometheus."""
+
+    def __init__(self, mode, file_path=None, port=None):
+        self.mode = mode
+        self.file_path = file_path
+        self.port = port
+        self.started = time.time()
+        self.duration = None
+        self.success = False
+        self.row_count = 0
+        self.pep_statuses = []
+        self.server = None
+
+    @property
+    def enabled(self):
+        return self.file_path is not None or self.port is not None
+
+    def collect(self, results):
+        if not self.enabled or results is None:
+            return results
+        return self._collect(results)
+
+    def _collect(self, results):
+        rows = iter(results)
+        for row in rows:
+            yield row
+            break
+        for row in rows:
+            self.row_count += 1
+            if self.mode == 'pep' and row[0] != TOTAL:
+                self.pep_statuses.append(
+                    ({'mode': self.mode, 'status': row[0]}, row[1])
+                )
+            yield row
+
+    def render(self):
+        mode = {'mode': self.mode}
+        duration = (
+            time.time() - self.started if self.duration is None
+            else self.duration
+        )
+        counters = PROFILER.counters
+        return ''.join((
+            render_metric(
+                'parser_last_run_timestamp_seconds',
+                'Время запуска парсера',
+                [(mode, self.started)]
+            ),
+            render_metric(
+                'parser_run_duration_seconds',
+                'Длительность работы режима',
+                [(mode, duration)]
+            ),
+            render_metric(
+                'parser_run_success',
+                'Режим завершился без ошибок',
+                [(mode, int(self.success))]
+            ),
+            render_metric(
+                'parser_pages_fetched',
+                'Количество загруженных страниц',
+                [(mode, counters[REQUESTS])]
+            ),
+            render_metric(
+                'parser_cache_hits',
+                'Количество ответов из кеша HTTP-запросов',
+                [(mode, counters[CACHE_HITS])]
+            ),
+            render_metric(
+                'parser_cache_misses',
+                'Количество ответов не из кеша HTTP-запросов',
+                [(mode, counters[REQUESTS] - counters[CACHE_HITS])]
+            ),
+            render_metric(
+                'parser_downloaded_bytes',
+                'Объём загруженных данных',
+                [(mode, counters[BYTES])]
+            ),
+            render_metric(
+                'parser_fetch_failures',
+                'Количество страниц, которые не удалось загрузить',
+                [(mode, counters[FAILURES])]
+            ),
+            render_metric(
+                'parser_stage_seconds',
+                'Время этапов работы парсера',
+                [
+                    ({**mode, 'stage': stage}, seconds)
+                    for stage, seconds in list(PROFILER.times.items())
+                ]
+            ),
+            render_metric(
+                'parser_result_rows',
+                'Количество строк результата',
+                [(mode, self.row_count)]
+            ),
+            render_metric(
+                'parser_pep_status',
+                'Количество PEP по статусам',
+                self.pep_statuses
+            ),
+        ))
+
+    def start(self):
+        if self.port is None:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != METRICS_PATH:
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(
+            (METRICS_HOST, self.port), MetricsHandler
+        )
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def finish(self):
+        self.duration = time.time() - self.started
+        if self.file_path is not None:
+            tmp_path = self.file_path.with_name(self.file_path.name + '.tmp')
+            tmp_path.write_text(self.render(), encoding='utf-8')
+            os.replace(tmp_path, self.file_path)
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
@@ -1,28 +1,143 @@
 import csv
 import datetime as dt
+from itertools import islice
+import json
 import logging
-
-from prettytable import PrettyTable
+import uuid
 
 from constants import (
-    BASE_DIR, DATETIME_FORMAT,
-    PRETTY, FILE, RESULTS_DIR
+    BASE_DIR, DATETIME_FORMAT, DOT, PARQUET_BATCH_SIZE, RESULTS_DATABASE,
+    PRETTY, FILE, JSONL, PARQUET, RESULTS_DIR, SQLITE
 )
 
 FILE_MESSAGE = 'Файл с результатами был сохранён: {file_path}'
+DATABASE_MESSAGE = (
+    'Результаты сохранены в таблицу {table} базы {file_path}, '
+    'идентификатор запуска {run_id}'
+)
+PARQUET_REQUIRED = 'Для вывода в формате parquet установите пакет pyarrow'
+DOT_EDGES_REQUIRED = (
+    'Формат dot доступен для результатов из рёбер графа '
+    '(источник, связь, цель), например режима pep-graph'
+)
+DOT_EDGE = '    {source} -> {target} [label={label}];\n'
 FILE_NAME = '{parser_mode}_{date}.csv'
+RESULTS_FILE_NAME = '{parser_mode}_{date}.{extension}'
 
 
-def file_output(results, cli_args):
+def get_results_dir():
     results_dir = BASE_DIR / RESULTS_DIR
     results_dir.mkdir(exist_ok=True)
+    return results_dir
+
+
+def get_run_id():
+    return dt.datetime.now().strftime(DATETIME_FORMAT)
+
+
+def get_database_run_id():
+    return f'{get_run_id()}_{uuid.uuid4().hex[:8]}'
+
+
+def file_output(results, cli_args):
     file_name = FILE_NAME.format(
         parser_mode=cli_args.mode,
-        date=dt.datetime.now().strftime(DATETIME_FORMAT)
+        date=get_run_id()
+    )
+    file_path = get_results_dir() / file_name
+    with open(file_path, 'w', encoding='utf-8') as f:
+        writer = csv.writer(f, dialect=csv.unix_dialect)
+        for row in results:
+            writer.writerow(row)
+            f.flush()
+    logging.info(FILE_MESSAGE.format(file_path=file_path))
+
+
+def jsonl_output(results, cli_args):
+    file_path = get_results_dir() / RESULTS_FILE_NAME.format(
+        parser_mode=cli_args.mode, date=get_run_id(), extension=JSONL
+    )
+    rows = iter(results)
+    header = next(rows)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False))
+            f.write('\n')
+            f.flush()
+    logging.info(FILE_MESSAGE.format(file_path=file_path))
+
+
+def sqlite_output(results, cli_args):
+    import sqlite3
+    file_path = get_results_dir() / RESULTS_DATABASE
+    table = cli_args.mode.replace('-', '_')
+    run_id = get_database_run_id()
+    rows = iter(results)
+    names = ('run_id', *next(rows))
+    columns = ', '.join(f'"{name}"' for name in names)
+    placeholders = ', '.join('?' * len(names))
+    connection = sqlite3.connect(file_path)
+    with connection:
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+        connection.executemany(
+            f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})',
+            ((run_id, *row) for row in rows)
+        )
+    connection.close()
+    logging.info(DATABASE_MESSAGE.format(
+        table=table, file_path=file_path, run_id=run_id
+    ))
+
+
+def parquet_output(results, cli_args):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(PARQUET_REQUIRED)
+    file_path = get_results_dir() / RESULTS_FILE_NAME.format(
+        parser_mode=cli_args.mode, date=get_run_id(), extension=PARQUET
+    )
+    rows = iter(results)
+    header = next(rows)
+    writer = None
+    while True:
+        batch = list(islice(rows, PARQUET_BATCH_SIZE))
+        if not batch:
+            break
+        table = pyarrow.Table.from_pydict(
+            dict(zip(header, zip(*batch))),
+            schema=None if writer is None else writer.schema
+        )
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(file_path, table.schema)
+        writer.write_table(table)
+    if writer is None:
+        return
+    writer.close()
+    logging.info(FILE_MESSAGE.format(file_path=file_path))
+
+
+def get_dot_id(value):
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def dot_output(results, cli_args):
+    rows = iter(results)
+    if len(next(rows)) != 3:
+        raise ValueError(DOT_EDGES_REQUIRED)
+    file_path = get_results_dir() / RESULTS_FILE_NAME.format(
+        parser_mode=cli_args.mode, date=get_run_id(), extension=DOT
     )
-    file_path = results_dir / file_name
     with open(file_path, 'w', encoding='utf-8') as f:
-        csv.writer(f, dialect=csv.unix_dialect).writerows(results)
+        f.write(f'digraph {get_dot_id(cli_args.mode)} {{\n')
+        for source, label, target in rows:
+            f.write(DOT_EDGE.format(
+                source=get_dot_id(source),
+                target=get_dot_id(target),
+                label=get_dot_id(label)
+            ))
+        f.write('}\n')
     logging.info(FILE_MESSAGE.format(file_path=file_path))
 
 
@@ -32,16 +147,22 @@ def default_output(results, cli_args=None):
 
 
 def pretty_output(results, cli_args=None):
+    from prettytable import PrettyTable
+    rows = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(rows))
     print(table)
 
 
 OUTPUT_FUNCTIONS = {
     PRETTY: pretty_output,
     FILE: file_output,
+    JSONL: jsonl_output,
+    SQLITE: sqlite_output,
+    PARQUET: parquet_output,
+    DOT: dot_output,
     None: default_output
 }
 
@@ -0,0 +1,89 @@
+from collections import defaultdict
+import re
+
+FINAL_STATUS = 'Final'
+REQUIRES = 'Requires'
+REPLACES = 'Replaces'
+SUPERSEDED_BY = 'Superseded-By'
+EDGE_FIELDS = {
+    REQUIRES: 'requires',
+    REPLACES: 'replaces',
+    SUPERSEDED_BY: 'superseded_by',
+}
+NUMBER_PATTERN = r'\d+'
+
+
+def get_numbers(value):
+    return [int(number) for number in re.findall(NUMBER_PATTERN, value)]
+
+
+class PepGraph:
+    """Граф связей между PEP из полей Requires, Replaces и Superseded-By.
+
+    `adjacency` и `reverse` хранят прямые и обратные рёбра каждого типа,
+    а `successors` и `predecessors` — замены PEP с учётом обоих полей
+    (A Replaces B и B Superseded-By A дают одно ребро B -> A).
+    """
+
+    def __init__(self, records=()):
+        self.records = {}
+        self.edges = []
+        self.adjacency = {kind: defaultdict(set) for kind in EDGE_FIELDS}
+        self.reverse = {kind: defaultdict(set) for kind in EDGE_FIELDS}
+        self.successors = defaultdict(set)
+        self.predecessors = defaultdict(set)
+        for record in records:
+            self.add(record)
+
+    def add_edge(self, source, kind, target):
+        if target in self.adjacency[kind][source]:
+            return
+        self.edges.append((source, kind, target))
+        self.adjacency[kind][source].add(target)
+        self.reverse[kind][target].add(source)
+        if kind == REPLACES:
+            source, target = target, source
+        if kind != REQUIRES:
+            self.successors[source].add(target)
+            self.predecessors[target].add(source)
+
+    def add(self, record):
+        self.records[record.number] = record
+        for kind, field in EDGE_FIELDS.items():
+            for target in get_numbers(getattr(record, field)):
+                self.add_edge(record.number, kind, target)
+
+    def get_status(self, number):
+        record = self.records.get(number)
+        return None if record is None else record.status
+
+    def get_superseded(self, number):
+        """Все PEP, которые прямо или через другие PEP заменила `number`."""
+        found = set()
+        stack = [number]
+        while stack:
+            for predecessor in self.predecessors[stack.pop()]:
+                if predecessor not in found and predecessor != number:
+                    found.add(predecessor)
+                    stack.append(predecessor)
+        return sorted(found)
+
+    def get_chains(self, number, chain=()):
+        chain = (number, *chain)
+        predecessors = [
+            predecessor for predecessor in sorted(self.predecessors[number])
+            if predecessor not in chain
+        ]
+        if not predecessors:
+            yield chain
+        for predecessor in predecessors:
+            yield from self.get_chains(predecessor, chain)
+
+    def get_final_chains(self):
+        """Цепочки замен, которые заканчиваются PEP со статусом Final."""
+        for number in sorted(self.predecessors):
+            if self.get_status(number) != FINAL_STATUS:
+                continue
+            for chain in self.get_chains(number):
+                if len(chain) > 1:
+                    yield chain
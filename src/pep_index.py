@@ -0,0 +1,49 @@
+import json
+import re
+
+PEP_NUMBER_PATTERN = r'pep-(?P<number>\d+)'
+
+
+def get_pep_number(url):
+    number_match = re.search(PEP_NUMBER_PATTERN, url)
+    return url if number_match is None else str(int(number_match['number']))
+
+
+def load_pep_index(path):
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_pep_index(index, path):
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(index, file, ensure_ascii=False)
+    temp_path.replace(path)
+
+
+def get_validators(response):
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def get_conditional_headers(entry):
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def is_unchanged(entry, response):
+    if response.status_code == 304:
+        return True
+    validators = get_validators(response)
+    return any(validators.values()) and all(
+        entry.get(name) == value for name, value in validators.items()
+    )
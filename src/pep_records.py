@@ -0,0 +1,85 @@
+from collections import defaultdict
+import re
+
+from pep_index import get_pep_number
+
+PEP_FIELDS = {
+    'Title': 'title',
+    'Status': 'status',
+    'Type': 'type',
+    'Topic': 'topic',
+    'Created': 'created',
+    'Python-Version': 'python_version',
+    'Author': 'author',
+    'Sponsor': 'sponsor',
+    'Discussions-To': 'discussions_to',
+    'Requires': 'requires',
+    'Replaces': 'replaces',
+    'Superseded-By': 'superseded_by',
+    'Resolution': 'resolution',
+    'Post-History': 'post_history',
+}
+INDEXED_FIELDS = ('status', 'python_version')
+TITLE_PATTERN = r'^PEP \d+\s*[–—-]\s*'
+VALUES_PATTERN = r'\s*,\s*'
+
+
+def split_values(value):
+    return [item for item in re.split(VALUES_PATTERN, value) if item]
+
+
+class PepRecord:
+    """Сведения из заголовка одной PEP."""
+
+    __slots__ = ('number', 'url', *PEP_FIELDS.values())
+
+    def __init__(self, number, url, **fields):
+        self.number = number
+        self.url = url
+        for name in PEP_FIELDS.values():
+            setattr(self, name, fields.get(name, ''))
+
+    @classmethod
+    def from_details(cls, url, details):
+        fields = {
+            PEP_FIELDS[name]: value
+            for name, value in details.items() if name in PEP_FIELDS
+        }
+        fields['title'] = re.sub(TITLE_PATTERN, '', fields.get('title', ''))
+        return cls(int(get_pep_number(url)), url, **fields)
+
+    def as_row(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+class PepStore:
+    """Хранилище записей PEP с индексами по статусу и версии Python."""
+
+    def __init__(self):
+        self.records = []
+        self.indexes = {field: defaultdict(set) for field in INDEXED_FIELDS}
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        position = len(self.records)
+        self.records.append(record)
+        for field, index in self.indexes.items():
+            for value in split_values(getattr(record, field)):
+                index[value].add(position)
+
+    def filter(self, **filters):
+        positions = None
+        for field, values in filters.items():
+            if not values:
+                continue
+            index = self.indexes[field]
+            found = set().union(*(index.get(value, ()) for value in values))
+            positions = found if positions is None else positions & found
+        if positions is None:
+            positions = range(len(self.records))
+        return sorted(
+            (self.records[position] for position in positions),
+            key=lambda record: record.number
+        )
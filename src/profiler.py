@@ -0,0 +1,192 @@
+from bisect import bisect
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+import json
+from threading import local, Lock
+import time
+
+from constants import PROFILE_BUCKETS
+
+NETWORK = 'network'
+HTTP_CACHE = 'http_cache'
+RECORDS_CACHE = 'records_cache'
+PARSE = 'parse'
+EXTRACT = 'extract'
+FIND_TAG = 'find_tag'
+MODE = 'mode'
+OUTPUT = 'output'
+
+REQUESTS = 'requests'
+CACHE_HITS = 'cache_hits'
+BYTES = 'bytes'
+FAILURES = 'failures'
+
+STAGES_HEAD = ('Этап', 'Вызовов', 'Всего, с', 'Среднее, мс', 'Максимум, мс')
+HISTOGRAM_HEAD = (
+    'Этап',
+    *(f'< {bucket} мс' for bucket in PROFILE_BUCKETS),
+    f'>= {PROFILE_BUCKETS[-1]} мс'
+)
+COUNTERS_MESSAGE = (
+    'Запросов: {requests}, из кеша: {cache_hits} ({ratio:.0%}), '
+    'загружено {size:.2f} МБ'
+)
+
+
+class Profiler:
+    """Таймеры и счётчики этапов работы парсера для опции --profile.
+
+    Время этапа учитывается без вложенных этапов того же потока, поэтому
+    время режима не включает загрузку и разбор страниц в основном потоке.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = Lock()
+        self.local = local()
+        self.calls = defaultdict(int)
+        self.times = defaultdict(float)
+        self.max_times = defaultdict(float)
+        self.histograms = defaultdict(
+            lambda: [0] * (len(PROFILE_BUCKETS) + 1)
+        )
+        self.counters = defaultdict(int)
+
+    def start(self):
+        if not self.enabled:
+            return None
+        self.local.__dict__.setdefault('nested', []).append(0)
+        return time.perf_counter()
+
+    def measure(self, started):
+        duration = time.perf_counter() - started
+        nested = self.local.nested
+        own = duration - nested.pop()
+        if nested:
+            nested[-1] += duration
+        return own
+
+    def stop(self, started, stage):
+        if started is None:
+            return
+        self.record(stage, self.measure(started))
+
+    def record(self, stage, own):
+        with self.lock:
+            self.calls[stage] += 1
+            self.times[stage] += own
+            self.max_times[stage] = max(self.max_times[stage], own)
+            self.histograms[stage][bisect(PROFILE_BUCKETS, own * 1000)] += 1
+
+    @contextmanager
+    def timer(self, stage):
+        started = self.start()
+        try:
+            yield
+        finally:
+            self.stop(started, stage)
+
+    def timed(self, stage):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def timed_iter(self, stage, results):
+        if not self.enabled or results is None:
+            return results
+        return self._timed_iter(stage, iter(results))
+
+    def _timed_iter(self, stage, results):
+        own = 0
+        try:
+            while True:
+                started = self.start()
+                try:
+                    row = next(results, StopIteration)
+                finally:
+                    own += self.measure(started)
+                if row is StopIteration:
+                    return
+                yield row
+        finally:
+            self.record(stage, own)
+
+    def count(self, counter, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[counter] += value
+
+    def count_response(self, response):
+        if not self.enabled:
+            return
+        self.count(REQUESTS)
+        if getattr(response, 'from_cache', False):
+            self.count(CACHE_HITS)
+        else:
+            self.count(BYTES, len(response.content))
+
+    def get_report(self):
+        requests = self.counters[REQUESTS]
+        return {
+            'stages': {
+                stage: {
+                    'calls': calls,
+                    'seconds': self.times[stage],
+                    'max_seconds': self.max_times[stage],
+                    'histogram_ms': dict(zip(
+                        HISTOGRAM_HEAD[1:], self.histograms[stage]
+                    )),
+                }
+                for stage, calls in self.calls.items()
+            },
+            'counters': {
+                **dict(self.counters),
+                'cache_hit_ratio': (
+                    self.counters[CACHE_HITS] / requests if requests else 0
+                ),
+            },
+        }
+
+    def print_report(self):
+        from prettytable import PrettyTable
+        stages = PrettyTable()
+        stages.field_names = STAGES_HEAD
+        stages.align = 'l'
+        histogram = PrettyTable()
+        histogram.field_names = HISTOGRAM_HEAD
+        histogram.align = 'l'
+        for stage, calls in sorted(
+            self.calls.items(), key=lambda item: -self.times[item[0]]
+        ):
+            stages.add_row((
+                stage,
+                calls,
+                f'{self.times[stage]:.3f}',
+                f'{self.times[stage] * 1000 / calls:.2f}',
+                f'{self.max_times[stage] * 1000:.2f}',
+            ))
+            histogram.add_row((stage, *self.histograms[stage]))
+        print(stages)
+        print(histogram)
+        counters = self.get_report()['counters']
+        print(COUNTERS_MESSAGE.format(
+            requests=self.counters[REQUESTS],
+            cache_hits=self.counters[CACHE_HITS],
+            ratio=counters['cache_hit_ratio'],
+            size=self.counters[BYTES] / 2 ** 20
+        ))
+
+    def save_report(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(self.get_report(), file, ensure_ascii=False, indent=2)
+
+
+PROFILER = Profiler()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import sqlite3
+from threading import Lock
+import time
+
+from constants import (
+    EXTRACTORS_VERSION, RECORDS_CACHE_SIZE, RECORDS_CACHE_TIMEOUT
+)
+
+
+class RecordsCache:
+    """Кеш извлечённых со страниц записей, чтобы не разбирать HTML заново.
+
+    Каждая запись сохраняется сразу (autocommit, журнал WAL), поэтому
+    несколько запусков парсера могут работать с кешем одновременно.
+    """
+
+    def __init__(
+        self, path, max_size=RECORDS_CACHE_SIZE, timeout=RECORDS_CACHE_TIMEOUT
+    ):
+        self.max_size = max_size
+        self.lock = Lock()
+        self.connection = sqlite3.connect(
+            path,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            'key TEXT PRIMARY KEY, version INTEGER, value TEXT, used REAL)'
+        )
+        self.connection.execute(
+            'DELETE FROM records WHERE version != ?', (EXTRACTORS_VERSION,)
+        )
+
+    @staticmethod
+    def get_key(response, extract):
+        validator = (
+            response.headers.get('ETag')
+            or response.headers.get('Last-Modified')
+            or hashlib.sha1(response.content).hexdigest()
+        )
+        return ' '.join((
+            response.url,
+            validator,
+            f'{extract.__module__}.{extract.__qualname__}',
+        ))
+
+    def get(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT value FROM records WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            self.connection.execute(
+                'UPDATE records SET used = ? WHERE key = ?',
+                (time.time(), key)
+            )
+        return True, json.loads(row[0])
+
+    def set(self, key, record):
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)',
+                (key, EXTRACTORS_VERSION, json.dumps(record), time.time())
+            )
+
+    def extract(self, response, extract):
+        key = self.get_key(response, extract)
+        found, record = self.get(key)
+        if not found:
+            record = extract(response.text)
+            self.set(key, record)
+        return record
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute('DELETE FROM records')
+
+    def close(self):
+        with self.lock:
+            self.connection.execute(
+                'DELETE FROM records WHERE key NOT IN ('
+                'SELECT key FROM records ORDER BY used DESC LIMIT ?)',
+                (self.max_size,)
+            )
+            self.connection.close()
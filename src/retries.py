@@ -0,0 +1,68 @@
+import random
+from threading import Lock
+import time
+
+from constants import (
+    BACKOFF_BASE, BACKOFF_MAX, BREAKER_FAILURES, BREAKER_RESET_AFTER
+)
+from exceptions import HostUnavailableException
+
+HOST_UNAVAILABLE = (
+    'Хост {host} недоступен после {failures} ошибок подряд, '
+    'запросы к нему приостановлены на {reset_after} с'
+)
+
+
+def get_backoff(attempt):
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Прерывает запросы к хосту после серии ошибок подряд.
+
+    Ошибкой считается страница, которую не удалось загрузить после всех
+    повторов, а не каждая неудачная попытка. Через `reset_after` секунд
+    запросы к хосту снова пропускаются: успешный ответ замыкает цепь, первая
+    же ошибка размыкает её ещё на `reset_after` секунд.
+    """
+
+    def __init__(
+        self, failures=BREAKER_FAILURES, reset_after=BREAKER_RESET_AFTER
+    ):
+        self.failures = failures
+        self.reset_after = reset_after
+        self.lock = Lock()
+        self.host_failures = {}
+        self.opened = {}
+
+    def check(self, host):
+        with self.lock:
+            opened = self.opened.get(host)
+            if opened is None:
+                return
+            if time.monotonic() - opened < self.reset_after:
+                raise HostUnavailableException(HOST_UNAVAILABLE.format(
+                    host=host,
+                    failures=self.host_failures[host],
+                    reset_after=self.reset_after
+                ))
+            del self.opened[host]
+            self.host_failures[host] = self.failures - 1
+
+    def get_wait(self, host):
+        with self.lock:
+            opened = self.opened.get(host)
+            if opened is None:
+                return 0
+            return max(0, opened + self.reset_after - time.monotonic())
+
+    def success(self, host):
+        with self.lock:
+            self.host_failures.pop(host, None)
+            self.opened.pop(host, None)
+
+    def failure(self, host):
+        with self.lock:
+            self.host_failures[host] = self.host_failures.get(host, 0) + 1
+            if self.host_failures[host] >= self.failures:
+                self.opened[host] = time.monotonic()
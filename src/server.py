@@ -0,0 +1,147 @@
+from collections import defaultdict
+import datetime as dt
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import socketserver
+from threading import Event, Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+from constants import SERVE_HOST, SERVE_PORT, SERVE_REFRESH
+
+SERVER_STARTED = 'Сервер парсера запущен: {address}'
+SERVER_STOPPED = 'Сервер парсера остановлен'
+REQUEST_MESSAGE = 'Запрос {path}: {status}'
+REFRESH_ERROR = 'Не удалось обновить результаты режима {mode}: {e}'
+MODE_NOT_FOUND = 'Режим {mode} не найден'
+CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class ParserServer:
+    """Результаты режимов парсера в памяти процесса с общей сессией.
+
+    Режим выполняется при первом запросе, а затем его результаты
+    обновляются в фоне раз в `refresh` секунд (при `refresh <= 0` - только
+    по запросу с `?refresh`).
+    """
+
+    def __init__(self, session, cli_args, modes, refresh=SERVE_REFRESH):
+        self.session = session
+        self.cli_args = cli_args
+        self.modes = modes
+        self.refresh = refresh
+        self.results = {}
+        self.locks = defaultdict(Lock)
+        self.stopped = Event()
+
+    def run_mode(self, mode):
+        results = self.modes[mode](self.session, self.cli_args)
+        rows = [] if results is None else list(results)
+        head = rows[0] if rows else ()
+        self.results[mode] = {
+            'mode': mode,
+            'updated': dt.datetime.now().isoformat(timespec='seconds'),
+            'results': [dict(zip(head, row)) for row in rows[1:]],
+        }
+
+    def get(self, mode, refresh=False):
+        with self.locks[mode]:
+            if refresh or mode not in self.results:
+                self.run_mode(mode)
+            return self.results[mode]
+
+    def get_index(self):
+        return {
+            mode: self.results.get(mode, {}).get('updated')
+            for mode in self.modes
+        }
+
+    def refresh_results(self):
+        if self.refresh <= 0:
+            return
+        while not self.stopped.wait(self.refresh):
+            for mode in list(self.results):
+                try:
+                    self.get(mode, refresh=True)
+                except Exception as e:
+                    logging.error(REFRESH_ERROR.format(mode=mode, e=e))
+
+    def make_handler(self):
+        server = self
+
+        class ParserRequestHandler(BaseHTTPRequestHandler):
+            def send_json(self, status, data):
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                logging.info(REQUEST_MESSAGE.format(
+                    path=self.path, status=status
+                ))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                mode = url.path.strip('/')
+                if not mode:
+                    self.send_json(200, server.get_index())
+                    return
+                if mode not in server.modes:
+                    self.send_json(404, {
+                        'error': MODE_NOT_FOUND.format(mode=mode)
+                    })
+                    return
+                refresh = 'refresh' in parse_qs(url.query)
+                try:
+                    results = server.get(mode, refresh)
+                except Exception as e:
+                    logging.exception(REFRESH_ERROR.format(mode=mode, e=e))
+                    self.send_json(500, {'error': str(e)})
+                    return
+                self.send_json(200, results)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ParserRequestHandler
+
+    def make_http_server(self, host, port, socket_path):
+        if socket_path is None:
+            return ThreadingHTTPServer((host, port), self.make_handler())
+        if socket_path.exists():
+            os.unlink(socket_path)
+        return UnixHTTPServer(str(socket_path), self.make_handler())
+
+    def serve(self, host=SERVE_HOST, port=SERVE_PORT, socket_path=None):
+        http_server = self.make_http_server(host, port, socket_path)
+        Thread(target=self.refresh_results, daemon=True).start()
+        logging.info(SERVER_STARTED.format(
+            address=socket_path or f'http://{host}:{port}/'
+        ))
+        try:
+            http_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            http_server.server_close()
+            logging.info(SERVER_STOPPED)
+
+
+def serve(session, cli_args, modes):
+    ParserServer(
+        session,
+        cli_args,
+        modes,
+        getattr(cli_args, 'refresh', SERVE_REFRESH)
+    ).serve(
+        getattr(cli_args, 'host', SERVE_HOST),
+        getattr(cli_args, 'port', SERVE_PORT),
+        getattr(cli_args, 'socket', None)
+    )
@@ -0,0 +1,124 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+from threading import Lock
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from constants import SNAPSHOT_BLOBS, SNAPSHOT_INDEX
+
+SNAPSHOT_MISSING = 'Страница {url} отсутствует в снимке {path}'
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+def get_key(method, url):
+    return f'{method} {url}'
+
+
+def load_index(path):
+    index_path = path / SNAPSHOT_INDEX
+    if not index_path.exists():
+        return {'blobs': {}, 'responses': {}}
+    with open(index_path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+class SnapshotWriter:
+    """Запись загруженных страниц в снимок сайта.
+
+    Тела ответов сжимаются и хранятся в одном файле по хешу содержимого,
+    поэтому одинаковые страницы записываются один раз; индекс связывает
+    запросы с заголовками и телами ответов. У ответов на HEAD сохраняется
+    Content-Length: по нему проверяются уже загруженные архивы.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index = load_index(path)
+        self.lock = Lock()
+        self.blobs = open(path / SNAPSHOT_BLOBS, 'ab')
+
+    def add(self, url, response):
+        self.add_body(
+            response.request.method,
+            url,
+            response.status_code,
+            response.headers,
+            response.content,
+            response.url
+        )
+
+    def add_body(
+        self, method, url, status, headers, body, response_url=None
+    ):
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock:
+            if digest not in self.index['blobs']:
+                data = zlib.compress(body)
+                self.index['blobs'][digest] = (self.blobs.tell(), len(data))
+                self.blobs.write(data)
+            self.index['responses'][get_key(method, url)] = {
+                'url': url if response_url is None else response_url,
+                'status': status,
+                'headers': {
+                    name: value for name, value in headers.items()
+                    if method == 'HEAD' or name.lower() not in SKIPPED_HEADERS
+                },
+                'body': digest,
+            }
+
+    def close(self):
+        with self.lock:
+            self.blobs.close()
+            tmp_path = self.path / (SNAPSHOT_INDEX + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(self.index, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path / SNAPSHOT_INDEX)
+
+
+class SnapshotAdapter(HTTPAdapter):
+    """Транспорт, который отвечает на запросы из снимка сайта без сети."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.index = load_index(path)
+        with open(path / SNAPSHOT_BLOBS, 'rb') as file:
+            self.blobs = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) if os.fstat(file.fileno()).st_size else b''
+
+    def get_body(self, digest):
+        offset, length = self.index['blobs'][digest]
+        return zlib.decompress(self.blobs[offset:offset + length])
+
+    def send(self, request, **kwargs):
+        entry = self.index['responses'].get(
+            get_key(request.method, request.url)
+        )
+        if entry is None:
+            raise requests.exceptions.ConnectionError(
+                SNAPSHOT_MISSING.format(url=request.url, path=self.path),
+                request=request
+            )
+        response = self.build_response(request, HTTPResponse(
+            body=io.BytesIO(self.get_body(entry['body'])),
+            headers=entry['headers'],
+            status=entry['status'],
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+        ))
+        response.url = entry['url']
+        return response
+
+    def close(self):
+        super().close()
+        if isinstance(self.blobs, mmap.mmap):
+            self.blobs.close()
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from functools import partial
+from threading import Condition, Lock
+import time
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+from constants import (
+    AIMD_DECREASE, HOST_RATE, HOST_WORKERS, INITIAL_HOST_WORKERS,
+    LATENCY_TOLERANCE, MAX_RETRY_AFTER, THROTTLE_DELAY, THROTTLE_RETRIES,
+    THROTTLE_STATUSES
+)
+
+
+def get_retry_after(response):
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        try:
+            seconds = (
+                parsedate_to_datetime(retry_after).timestamp() - time.time()
+            )
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+class HostLimiter:
+    """Маркерная корзина и AIMD-регулятор параллельности запросов к хосту.
+
+    Параллельность растёт на единицу за окно успешных запросов, пока задержка
+    не превышает минимальную в `LATENCY_TOLERANCE` раз, и уменьшается в
+    `AIMD_DECREASE` раз при ошибках и ответах 429/503.
+    """
+
+    def __init__(self, rate=HOST_RATE, max_workers=HOST_WORKERS):
+        self.rate = rate
+        self.burst = max(rate, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.max_workers = max_workers
+        self.limit = min(INITIAL_HOST_WORKERS, max_workers)
+        self.active = 0
+        self.blocked_until = 0
+        self.min_latency = None
+        self.condition = Condition()
+
+    def get_wait(self, now):
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.active >= int(self.limit):
+            return None
+        if self.rate and self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.rate:
+                    self.tokens = min(
+                        self.burst,
+                        self.tokens + (now - self.updated) * self.rate
+                    )
+                self.updated = now
+                wait = self.get_wait(now)
+                if wait == 0:
+                    break
+                self.condition.wait(wait)
+            self.active += 1
+            if self.rate:
+                self.tokens -= 1
+
+    def release(self, latency, status=None, retry_after=None):
+        with self.condition:
+            self.active -= 1
+            if status in THROTTLE_STATUSES:
+                self.blocked_until = max(
+                    self.blocked_until,
+                    time.monotonic() + (
+                        THROTTLE_DELAY if retry_after is None else retry_after
+                    )
+                )
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                self.limit = max(1, self.limit * AIMD_DECREASE)
+            else:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency <= self.min_latency * LATENCY_TOLERANCE:
+                    self.limit = min(
+                        self.max_workers, self.limit + 1 / self.limit
+                    )
+            self.condition.notify_all()
+
+
+class ThrottlingAdapter(HTTPAdapter):
+    """Транспорт с ограничением частоты и параллельности запросов по хостам.
+
+    Запросы, на которые ответил кеш, сюда не попадают и не ограничиваются.
+    `timeout` используется для запросов, в которых таймаут не указан.
+    """
+
+    def __init__(
+        self,
+        rate=HOST_RATE,
+        max_workers=HOST_WORKERS,
+        throttle_retries=THROTTLE_RETRIES,
+        timeout=None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.throttle_retries = throttle_retries
+        self.timeout = timeout
+        self.limiters = defaultdict(
+            partial(HostLimiter, rate, max_workers)
+        )
+        self.limiters_lock = Lock()
+
+    def get_limiter(self, url):
+        with self.limiters_lock:
+            return self.limiters[urlparse(url).netloc]
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        limiter = self.get_limiter(request.url)
+        for attempt in range(self.throttle_retries + 1):
+            limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = super().send(request, **kwargs)
+            except Exception:
+                limiter.release(time.monotonic() - start)
+                raise
+            limiter.release(
+                time.monotonic() - start,
+                response.status_code,
+                get_retry_after(response)
+            )
+            if (
+                response.status_code not in THROTTLE_STATUSES
+                or attempt == self.throttle_retries
+            ):
+                return response
+            response.close()
@@ -1,28 +1,326 @@
-from bs4 import BeautifulSoup
-import requests
+from collections import defaultdict
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from functools import partial
+import logging
+import time
+from urllib.parse import urlparse
 
-from exceptions import ParserFindTagException
+from constants import (
+    DOWNLOAD_CHUNK_SIZE, HOST_WORKERS, PROCESSES, RETRIES, RETRY_STATUSES,
+    THROTTLE_STATUSES, WORKERS
+)
+from exceptions import (
+    HostUnavailableException, ParserFindTagException, ThrottledException
+)
+from profiler import (
+    BYTES, EXTRACT, FAILURES, FIND_TAG, HTTP_CACHE, NETWORK, PARSE, PROFILER,
+    RECORDS_CACHE, REQUESTS
+)
+from retries import get_backoff
 
 LOG_MESSAGE = 'Возникла ошибка при загрузке страницы {url}: {e}'
 NOT_FOUND_MESSAGE = 'Не найден тег {tag} {attrs}'
 EMPTY_ANSWER = 'Пустой ответ для {url}'
+STATUS_MESSAGE = 'сервер вернул статус {status}'
+RETRY_MESSAGE = (
+    'Попытка {attempt} загрузки {url} не удалась, '
+    'повтор через {delay:.1f} с: {e}'
+)
+RETRY_FAILED = 'Повторная загрузка {count} страниц с ошибками'
+HOSTS_WAIT = 'Ожидание восстановления недоступных хостов: {delay:.1f} с'
 
 
-def get_response(session, url, encoding='utf-8'):
+def send_request(session, url, headers=None):
+    import requests
+    started = PROFILER.start()
     try:
-        response = session.get(url)
-        response.encoding = encoding
-        return response
+        response = session.get(url, headers=headers)
     except requests.exceptions.RequestException as e:
+        PROFILER.stop(started, NETWORK)
         raise ConnectionError(
             LOG_MESSAGE.format(url=url, e=e)
         )
+    PROFILER.stop(
+        started,
+        HTTP_CACHE if getattr(response, 'from_cache', False) else NETWORK
+    )
+    PROFILER.count_response(response)
+    message = LOG_MESSAGE.format(
+        url=url, e=STATUS_MESSAGE.format(status=response.status_code)
+    )
+    if response.status_code in THROTTLE_STATUSES:
+        raise ThrottledException(message)
+    if response.status_code in RETRY_STATUSES:
+        raise ConnectionError(message)
+    return response
+
+
+def get_response(session, url, encoding='utf-8', headers=None):
+    host = urlparse(url).netloc
+    circuit_breaker = getattr(session, 'circuit_breaker', None)
+    retries = getattr(session, 'retries', RETRIES)
+    for attempt in range(retries + 1):
+        if circuit_breaker is not None:
+            circuit_breaker.check(host)
+        try:
+            response = send_request(session, url, headers)
+        except ThrottledException:
+            raise
+        except ConnectionError as e:
+            if attempt == retries:
+                if circuit_breaker is not None:
+                    circuit_breaker.failure(host)
+                raise
+            delay = get_backoff(attempt)
+            logging.warning(RETRY_MESSAGE.format(
+                attempt=attempt + 1, url=url, delay=delay, e=e
+            ))
+            time.sleep(delay)
+            continue
+        if circuit_breaker is not None:
+            circuit_breaker.success(host)
+        snapshot = getattr(session, 'snapshot', None)
+        if snapshot is not None:
+            snapshot.add(url, response)
+        response.encoding = encoding
+        return response
+
+
+@PROFILER.timed(PARSE)
+def make_soup(text, features='lxml', parse_only=None):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, features=features, parse_only=parse_only)
+
+
+def get_soup(session, url, features='lxml', parse_only=None):
+    return make_soup(get_response(session, url).text, features, parse_only)
+
+
+def get_page(session, url, extract=None, headers=None, encoding='utf-8'):
+    response = get_response(session, url, encoding, headers)
+    if extract is None:
+        return response
+    records_cache = getattr(session, 'records_cache', None)
+    if records_cache is None or not hasattr(extract, '__qualname__'):
+        return PROFILER.timed(EXTRACT)(extract)(response.text)
+    with PROFILER.timer(RECORDS_CACHE):
+        return records_cache.extract(
+            response, PROFILER.timed(EXTRACT)(extract)
+        )
+
+
+async def get_page_async(
+    session, url, extract=None, headers=None, executor=None, encoding='utf-8'
+):
+    import asyncio
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, get_page, session, url, extract, headers, encoding
+    )
+
 
+async def fetch_pages(
+    session, urls, extract=None, workers=WORKERS, headers=None,
+    encoding='utf-8'
+):
+    import asyncio
+    headers = {} if headers is None else headers
+    host_semaphores = defaultdict(partial(asyncio.Semaphore, HOST_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
 
-def get_soup(session, url, features='lxml'):
-    return BeautifulSoup(get_response(session, url).text, features=features)
+        async def fetch(url):
+            async with host_semaphores[urlparse(url).netloc]:
+                try:
+                    return url, await get_page_async(
+                        session, url, extract, headers.get(url), executor,
+                        encoding
+                    ), None
+                except ConnectionError as e:
+                    return url, None, e
+
+        tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_pages(
+    session, urls, extract=None, workers=WORKERS, headers=None,
+    encoding='utf-8'
+):
+    import asyncio
+    loop = asyncio.new_event_loop()
+    pages = fetch_pages(session, urls, extract, workers, headers, encoding)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(pages.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(pages.aclose())
+        loop.close()
+
+
+def wait_for_hosts(session, urls):
+    circuit_breaker = getattr(session, 'circuit_breaker', None)
+    if circuit_breaker is None or not urls:
+        return
+    delay = max(
+        circuit_breaker.get_wait(urlparse(url).netloc) for url in urls
+    )
+    if delay:
+        logging.warning(HOSTS_WAIT.format(delay=delay))
+        time.sleep(delay)
 
 
+def get_pages(
+    session, urls, extract=None, workers=WORKERS, headers=None,
+    encoding='utf-8'
+):
+    failed = []
+    unavailable = []
+    for url, page, error in run_pages(
+        session, urls, extract, workers, headers, encoding
+    ):
+        if isinstance(error, ThrottledException):
+            PROFILER.count(FAILURES)
+            yield url, None, error
+        elif isinstance(error, HostUnavailableException):
+            unavailable.append(url)
+        elif error is None:
+            yield url, page, None
+        else:
+            failed.append(url)
+    if not failed and not unavailable:
+        return
+    wait_for_hosts(session, unavailable)
+    logging.warning(RETRY_FAILED.format(count=len(failed) + len(unavailable)))
+    for url, page, error in run_pages(
+        session, failed + unavailable, extract, workers, headers, encoding
+    ):
+        if error is not None:
+            PROFILER.count(FAILURES)
+        if isinstance(error, HostUnavailableException):
+            raise error
+        yield url, page, error
+
+
+def extract_pages(
+    session, urls, extract, workers=WORKERS, processes=PROCESSES, headers=None,
+    encoding='utf-8'
+):
+    if processes <= 1:
+        yield from get_pages(
+            session, urls, extract, workers, headers, encoding
+        )
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+    records_cache = getattr(session, 'records_cache', None)
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=get_context('spawn')
+    ) as executor:
+        futures = {}
+        for url, response, error in get_pages(
+            session, urls, workers=workers, headers=headers, encoding=encoding
+        ):
+            if error is not None:
+                yield url, None, error
+                continue
+            key = None
+            if records_cache is not None:
+                key = records_cache.get_key(response, extract)
+                found, record = records_cache.get(key)
+                if found:
+                    yield url, record, None
+                    continue
+            futures[executor.submit(extract, response.text)] = url, key
+        for future in as_completed(futures):
+            url, key = futures[future]
+            record = future.result()
+            if key is not None:
+                records_cache.set(key, record)
+            yield url, record, None
+
+
+def get_soups(
+    session, urls, workers=WORKERS, features='lxml', parse_only=None,
+    encoding='utf-8'
+):
+    return get_pages(
+        session,
+        urls,
+        partial(make_soup, features=features, parse_only=parse_only),
+        workers,
+        encoding=encoding
+    )
+
+
+def is_downloaded(path, etag_path, remote_size, remote_etag):
+    if not path.exists():
+        return False
+    if remote_etag is not None and etag_path.exists():
+        return etag_path.read_text() == remote_etag
+    return (
+        remote_size is not None and path.stat().st_size == int(remote_size)
+    )
+
+
+def get_download_session(session):
+    import requests
+    download_session = requests.Session()
+    download_session.headers.update(session.headers)
+    for prefix, adapter in session.adapters.items():
+        download_session.mount(prefix, adapter)
+    return download_session
+
+
+def download_file(session, url, path):
+    part_path = path.with_name(path.name + '.part')
+    etag_path = path.with_name(path.name + '.etag')
+    download_session = get_download_session(session)
+    headers = download_session.head(url, allow_redirects=True).headers
+    remote_size = headers.get('Content-Length')
+    remote_etag = headers.get('ETag')
+    if is_downloaded(path, etag_path, remote_size, remote_etag):
+        return False
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    range_headers = {}
+    if offset:
+        range_headers['Range'] = f'bytes={offset}-'
+        validator = remote_etag or headers.get('Last-Modified')
+        if validator is not None:
+            range_headers['If-Range'] = validator
+    with download_session.get(
+        url, headers=range_headers, stream=True
+    ) as response:
+        PROFILER.count(REQUESTS)
+        response.raise_for_status()
+        mode = 'ab' if response.status_code == 206 else 'wb'
+        with open(part_path, mode) as file:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+                PROFILER.count(BYTES, len(chunk))
+    part_path.replace(path)
+    if remote_etag is not None:
+        etag_path.write_text(remote_etag)
+    return True
+
+
+def check_archive(path):
+    import zipfile
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.testzip() is None
+    except zipfile.BadZipFile:
+        return False
+
+
+@PROFILER.timed(FIND_TAG)
 def find_tag(soup, tag, attrs=None, string=''):
     searched_tag = soup.find(
         tag, attrs=({} if attrs is None else attrs), string=string
@@ -33,3 +331,23 @@ def find_tag(soup, tag, attrs=None, string=''):
                 tag=tag, attrs=attrs
             ))
     return searched_tag
+
+
+@PROFILER.timed(PARSE)
+def get_tree(text):
+    from lxml import etree, html
+    try:
+        return html.document_fromstring(text)
+    except etree.ParserError:
+        return html.Element('html')
+
+
+@PROFILER.timed(FIND_TAG)
+def find_element(tree, xpath, tag, attrs=None):
+    elements = tree.xpath(xpath)
+    if not elements:
+        raise ParserFindTagException(
+            NOT_FOUND_MESSAGE.format(
+                tag=tag, attrs=attrs
+            ))
+    return elements[0]
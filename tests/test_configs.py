@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'sqlite', 'parquet', 'dot'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,42 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('workers, expected', [(None, 8), (3, 3), (20, 8)])
+def test_mount_adapters_host_workers(mock_session, workers, expected):
+    args = argparse.Namespace() if workers is None else argparse.Namespace(
+        workers=workers
+    )
+    configs.mount_adapters(mock_session, args)
+    adapter = mock_session.get_adapter('https://peps.python.org/')
+    assert adapter.get_limiter('https://peps.python.org/').max_workers == (
+        expected
+    ), (
+        'Параллельность запросов к хосту должна подбираться ограничителем '
+        'до `--workers`, но не больше `HOST_WORKERS`'
+    )
+
+
+def test_expire_url_overrides_patterns():
+    from requests_cache.policy.expiration import get_url_expiration
+    parser = configs.configure_argument_parser(['pep'])
+    args = parser.parse_args([
+        'pep',
+        '--expire-url', 'peps.python.org/pep-*=60',
+        '--expire-url', 'docs.python.org/3/download.html=0',
+    ])
+    urls_expire_after = configs.get_urls_expire_after(args)
+    assert get_url_expiration(
+        'https://peps.python.org/pep-0008/', urls_expire_after
+    ) == 60, (
+        'Шаблоны из `--expire-url` должны переопределять шаблоны по умолчанию'
+    )
+    assert get_url_expiration(
+        'https://docs.python.org/3/download.html', urls_expire_after
+    ) == 0
+    assert get_url_expiration(
+        'https://docs.python.org/3/', urls_expire_after
+    ) is None, 'Для остальных страниц должна действовать `--expire-after`'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--expire-url', 'peps.python.org'])
@@ -0,0 +1,83 @@
+import pytest
+try:
+    from src import extractors
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+
+WHATS_NEW_INDEX = (
+    '<section id="what-s-new-in-python"><div class="toctree-wrapper">'
+    '<ul><li class="toctree-l1"><a href="3.12.html">3.12</a></li>'
+    '<li class="toctree-l1"><a href="3.11.html">3.11</a></li></ul>'
+    '</div></section>'
+)
+WHATS_NEW_PAGE = (
+    '<h1>What’s New In Python 3.12</h1>'
+    '<dl><dt>Editor</dt>\n<dd>Adam Turner</dd></dl>'
+)
+MAIN_PAGE = (
+    '<div class="sphinxsidebarwrapper"><ul><li>Docs</li></ul><ul>'
+    '<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a>'
+    '</li><li><a href="https://www.python.org/doc/versions/">'
+    'All versions</a></li></ul></div>'
+)
+PEP_INDEX = (
+    '<table><tr class="row-odd"><td><abbr>SF</abbr></td><td>'
+    '<a class="pep reference internal" href="pep-0008/">8</a></td></tr>'
+    '<tr class="row-even"><td><abbr>I</abbr></td><td>'
+    '<a class="pep reference internal" href="pep-0001/">1</a></td></tr>'
+    '<tr class="row-odd"><td>Без ссылки</td></tr></table>'
+)
+PEP_PAGE = (
+    '<dl class="rfc2822 field-list simple"><dt>Author<span>:</span></dt>'
+    '<dd>Guido</dd><dt>Status<span>:</span></dt>'
+    '<dd><abbr>Active</abbr></dd></dl>'
+)
+
+PEP_DETAILS_PAGE = (
+    '<h1 class="page-title">PEP 8 – Style Guide</h1>'
+    '<dl class="rfc2822 field-list simple"><dt>Author<span>:</span></dt>'
+    '<dd>Guido,\n  Barry</dd><dt>Status<span>:</span></dt>'
+    '<dd><abbr>Active</abbr></dd><dt>Requires<span>:</span></dt>'
+    '<dd><a href="../pep-0001/">1</a>, <a href="../pep-0007/">7</a></dd>'
+    '</dl><dl><dt>Не заголовок</dt><dd>Текст</dd></dl>'
+)
+
+
+@pytest.mark.parametrize('name, text', [
+    ('whats_new_links', WHATS_NEW_INDEX),
+    ('whats_new_page', WHATS_NEW_PAGE),
+    ('latest_versions', MAIN_PAGE),
+    ('pep_rows', PEP_INDEX),
+    ('pep_status', PEP_PAGE),
+    ('pep_status', '<p>Нет таблицы</p>'),
+    ('pep_details', PEP_DETAILS_PAGE),
+    ('pep_details', '<p>Нет таблицы</p>'),
+])
+def test_engines_are_equal(name, text):
+    got = extractors.EXTRACTORS['lxml'][name](text)
+    expected = extractors.EXTRACTORS['bs4'][name](text)
+    assert got == expected, (
+        f'Движки bs4 и lxml вернули разные данные для `{name}`'
+    )
+
+
+@pytest.mark.parametrize('engine', ['bs4', 'lxml'])
+def test_engine_not_found_exception(engine):
+    with pytest.raises(BaseException) as excinfo:
+        extractors.EXTRACTORS[engine]['whats_new_page']('<p></p>')
+    assert excinfo.typename == 'ParserFindTagException', (
+        f'Движок {engine} должен выбрасывать `ParserFindTagException`, '
+        'если тег не найден'
+    )
+    assert 'Не найден тег h1 None' in str(excinfo.value)
+
+
+def test_pep_details():
+    assert extractors.bs4_pep_details(PEP_DETAILS_PAGE) == {
+        'Title': 'PEP 8 – Style Guide',
+        'Author': 'Guido, Barry',
+        'Status': 'Active',
+        'Requires': '1, 7',
+    }
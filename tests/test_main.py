@@ -1,5 +1,6 @@
 import pytest
 from pathlib import Path
+from types import GeneratorType
 try:
     from src import main
 except ModuleNotFoundError:
@@ -33,9 +34,10 @@ def test_main_file():
 def test_whats_new(mock_session):
     got = main.whats_new(mock_session)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
-    assert isinstance(got, list), (
-        'Функция `whats_new` должна возвращать объект типа `list`'
+    assert isinstance(got, GeneratorType), (
+        'Функция `whats_new` должна отдавать строки результата генератором'
     )
+    got = list(got)
     assert len(got) > 0, (
         'Убедитесь что функция `whats_new` модуля `main.py` '
         'возвращает непустой список'
@@ -123,7 +125,10 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'pep',
+                'pep-details', 'pep-graph'
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,9 +139,265 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'pep',
+                'pep_details', 'pep_graph'
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+def test_download_rejects_snapshots(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(
+        'sys.argv', ['main.py', 'download', '--replay', str(tmp_path)]
+    )
+    with pytest.raises(SystemExit):
+        main.main()
+    assert 'download' in capsys.readouterr().err, (
+        'Режим download с --record/--replay должен завершаться понятной '
+        'ошибкой'
+    )
+
+
+def test_run_parser_closes_snapshot_on_error(monkeypatch):
+    from argparse import Namespace
+
+    class Closable:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    class Session:
+        records_cache = Closable()
+        snapshot = Closable()
+
+    def failing_mode(session, cli_args=None):
+        raise ConnectionError('boom')
+
+    monkeypatch.setattr(main, 'configure_session', lambda args: Session)
+    monkeypatch.setitem(main.MODE_TO_FUNCTION, 'pep', failing_mode)
+    with pytest.raises(ConnectionError):
+        main.run_parser(Namespace(mode='pep'), None)
+    assert Session.records_cache.closed and Session.snapshot.closed, (
+        'Кеш записей и снимок сайта должны сохраняться и при ошибке режима'
+    )
+
+
+PEPS_URL = 'https://peps.python.org/'
+PEP_STATUSES = (
+    ('SF', 'Final'), ('S', 'Draft'), ('I', 'Active'), ('SR', 'Rejected')
+)
+
+
+def get_pep_listing():
+    return [
+        (abbr[1:], f'{PEPS_URL}pep-{number:04d}/')
+        for number, (abbr, _) in enumerate(PEP_STATUSES)
+    ]
+
+
+def test_update_pep_index(monkeypatch, tmp_path):
+    import requests
+    import requests_mock
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    parsed = []
+
+    def extract(text):
+        parsed.append(text)
+        return text
+
+    session = requests.Session()
+    with requests_mock.Mocker(session=session) as mock:
+        for number, (_, status) in enumerate(PEP_STATUSES):
+            mock.get(f'{PEPS_URL}pep-{number:04d}/', [
+                {'text': status, 'headers': {'ETag': f'"{number}"'}},
+                {'status_code': 304, 'headers': {'ETag': f'"{number}"'}},
+            ])
+        first = main.update_pep_index(session, get_pep_listing(), extract)
+        second = main.update_pep_index(session, get_pep_listing(), extract)
+        second_requests = mock.request_history[len(PEP_STATUSES):]
+    assert first == second == {
+        url: status for (_, url), (_, status)
+        in zip(get_pep_listing(), PEP_STATUSES)
+    }
+    assert len(parsed) == len(PEP_STATUSES), (
+        'При повторном запуске неизменившиеся страницы не должны разбираться'
+    )
+    assert sorted(
+        request.headers['If-None-Match'] for request in second_requests
+    ) == [f'"{number}"' for number in range(len(PEP_STATUSES))], (
+        'Повторный запуск должен отправлять условные запросы по ETag'
+    )
+
+
+def get_pep_index_page():
+    return '<html><body><table>{rows}</table></body></html>'.format(rows=''.join(
+        '<tr class="row-odd"><td><abbr>{abbr}</abbr></td>'
+        '<td><a class="pep reference internal" href="pep-{number:04d}/">'
+        '{number}</a></td></tr>'.format(abbr=abbr, number=number)
+        for number, (abbr, _) in enumerate(PEP_STATUSES)
+    ))
+
+
+def get_pep_page(status):
+    return (
+        '<html><body><dl class="rfc2822 field-list simple">'
+        f'<dt>Status<span>:</span></dt><dd><abbr>{status}</abbr></dd>'
+        '</dl></body></html>'
+    )
+
+
+def run_pep(cli_args):
+    import requests
+    import requests_mock
+    session = requests.Session()
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(PEPS_URL, text=get_pep_index_page())
+        for number, (_, status) in enumerate(PEP_STATUSES):
+            mock.get(
+                f'{PEPS_URL}pep-{number:04d}/', text=get_pep_page(status)
+            )
+        results = list(main.pep(session, cli_args))
+        return results, [request.url for request in mock.request_history]
+
+
+def test_pep_fast():
+    from argparse import Namespace
+    fast_results, fast_urls = run_pep(Namespace(fast=True))
+    results, urls = run_pep(Namespace())
+    assert sorted(fast_urls) == [
+        PEPS_URL, f'{PEPS_URL}pep-0001/', f'{PEPS_URL}pep-0002/'
+    ], (
+        'В режиме --fast должны загружаться только страницы PEP '
+        'с неоднозначным статусом'
+    )
+    assert len(urls) == len(PEP_STATUSES) + 1
+    assert sorted(fast_results[1:]) == sorted(results[1:]), (
+        'Режим --fast должен давать те же количества статусов'
+    )
+
+
+def test_incremental_and_fast_are_exclusive():
+    from src import configs
+    with pytest.raises(SystemExit):
+        configs.configure_argument_parser(['pep']).parse_args(
+            ['pep', '--fast', '--incremental']
+        )
+
+
+def make_archive(corrupt=False):
+    import io
+    import zipfile
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        archive.writestr('docs.txt', 'Python documentation')
+    data = buffer.getvalue()
+    if corrupt:
+        data = data.replace(b'Python', b'Pithon', 1)
+    return data
+
+
+def test_download_formats(monkeypatch, tmp_path, caplog):
+    import logging
+    from argparse import Namespace
+    import requests
+    import requests_mock
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    caplog.set_level(logging.INFO)
+    docs_url = 'https://docs.python.org/3/'
+    archives = {
+        'python-3.13-docs-pdf-a4.zip': make_archive(),
+        'python-3.13-docs-text.zip': make_archive(),
+        'python-3.13-docs-html.zip': make_archive(corrupt=True),
+        'python-3.13-docs-pdf-letter.zip': make_archive(),
+    }
+    session = requests.Session()
+    adapter = requests_mock.Adapter()
+    adapter.register_uri(
+        'GET',
+        f'{docs_url}download.html',
+        text='<div role="main"><table class="docutils">{links}</table></div>'
+        .format(links=''.join(
+            f'<tr><td><a href="archives/{name}">{name}</a></td></tr>'
+            for name in archives
+        ))
+    )
+    for name, data in archives.items():
+        for method in ('HEAD', 'GET'):
+            adapter.register_uri(
+                method,
+                f'{docs_url}archives/{name}',
+                content=b'' if method == 'HEAD' else data,
+                headers={'Content-Length': str(len(data))}
+            )
+    session.mount('https://', adapter)
+    main.download(
+        session, Namespace(formats=['pdf-a4', 'text', 'html', 'epub'])
+    )
+    downloads_dir = tmp_path / 'downloads'
+    assert sorted(path.name for path in downloads_dir.iterdir()) == [
+        'python-3.13-docs-pdf-a4.zip', 'python-3.13-docs-text.zip'
+    ], (
+        'Должны загружаться только выбранные форматы, а повреждённый '
+        'архив должен удаляться после проверки'
+    )
+    assert main.ARCHIVE_IS_BROKEN.format(
+        path=downloads_dir / 'python-3.13-docs-html.zip'
+    ) in caplog.text
+    assert main.ERROR_MESSAGE.format(element='epub') in caplog.text, (
+        'Отсутствующий на странице формат должен попадать в лог ошибок'
+    )
+    assert 'МБ/с' in caplog.text, (
+        'Режим download должен логировать скорость загрузки'
+    )
+
+
+def test_whats_new_order_and_errors(caplog):
+    import time
+    import requests
+    import requests_mock
+    whats_new_url = 'https://docs.python.org/3/whatsnew/'
+    versions = ('3.13', '3.12', '3.11', '3.13', '3.10')
+    broken_url = f'{whats_new_url}3.11.html'
+
+    def get_page(delay):
+        def page(request, context):
+            time.sleep(delay)
+            return (
+                '<html><body><h1>What’s New</h1>'
+                '<dl><dt>Editor</dt><dd>Guido</dd></dl></body></html>'
+            )
+        return page
+
+    session = requests.Session()
+    session.retries = 0
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', whats_new_url, text=(
+        '<section id="what-s-new-in-python">'
+        '<div class="toctree-wrapper compound"><ul>{items}</ul></div>'
+        '</section>'
+    ).format(items=''.join(
+        f'<li class="toctree-l1"><a href="{version}.html">{version}</a></li>'
+        for version in versions
+    )))
+    for version, delay in (('3.13', 0.2), ('3.12', 0.1), ('3.10', 0)):
+        adapter.register_uri(
+            'GET', f'{whats_new_url}{version}.html', text=get_page(delay)
+        )
+    adapter.register_uri(
+        'GET', broken_url, exc=requests.exceptions.ConnectTimeout
+    )
+    session.mount('https://', adapter)
+    rows = list(main.whats_new(session))
+    assert [row[0] for row in rows[1:]] == [
+        f'{whats_new_url}{version}.html'
+        for version in versions if version != '3.11'
+    ], (
+        'Строки должны выводиться в порядке оглавления, включая повторы, '
+        'даже если поздние страницы загрузились раньше'
+    )
+    assert f'Не найден url: {broken_url}' in caplog.text, (
+        'Ошибка загрузки страницы должна попадать в лог вместе с её url'
+    )
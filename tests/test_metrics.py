@@ -0,0 +1,46 @@
+try:
+    from src.metrics import Metrics
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+
+def test_metrics_file(tmp_path):
+    file_path = tmp_path / 'parser.prom'
+    metrics = Metrics('pep', file_path)
+    rows = [('Статус', 'Количество'), ('A', 3), ('', 1), ('Всего', 4)]
+    assert list(metrics.collect(iter(rows))) == rows
+    metrics.success = True
+    metrics.finish()
+    text = file_path.read_text(encoding='utf-8')
+    assert 'parser_run_success{mode="pep"} 1' in text
+    assert 'parser_pep_status{mode="pep",status="A"} 3' in text
+    assert 'parser_pep_status{mode="pep",status=""} 1' in text
+    assert 'parser_result_rows{mode="pep"} 3' in text
+    assert 'status="Всего"' not in text, (
+        'Итоговая строка не должна попадать в метрики статусов'
+    )
+
+
+def test_metrics_do_not_keep_rows(tmp_path):
+    file_path = tmp_path / 'parser.prom'
+    metrics = Metrics('whats-new', file_path)
+    rows = [('Ссылка', 'Заголовок', 'Редактор')] + [
+        (f'https://a/{number}', 'Title', 'Editor') for number in range(3)
+    ]
+    assert list(metrics.collect(iter(rows))) == rows
+    metrics.finish()
+    assert metrics.pep_statuses == [] and not hasattr(metrics, 'rows'), (
+        'Метрики не должны хранить строки результатов'
+    )
+    text = file_path.read_text(encoding='utf-8')
+    assert 'parser_result_rows{mode="whats-new"} 3' in text
+
+
+def test_metrics_disabled():
+    metrics = Metrics('pep')
+    rows = iter([('Статус', 'Количество')])
+    assert metrics.collect(rows) is rows, (
+        'Без файла и порта метрик результаты не должны оборачиваться'
+    )
@@ -80,6 +80,47 @@ def test_control_output_file(monkeypatch, tmp_path, records, cli_arg):
     )
 
 
+ROWS = [('Статус', 'Количество'), ('A', 3), ('F', 5)]
+
+
+def test_jsonl_output(monkeypatch, tmp_path):
+    import json
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    outputs.control_output(iter(ROWS), cli_args('pep', 'jsonl'))
+    file, = tmp_path.glob('results/pep_*.jsonl')
+    assert [
+        json.loads(line)
+        for line in file.read_text(encoding='utf-8').splitlines()
+    ] == [{'Статус': 'A', 'Количество': 3}, {'Статус': 'F', 'Количество': 5}]
+
+
+def test_sqlite_output(monkeypatch, tmp_path):
+    import sqlite3
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    for _ in range(2):
+        outputs.control_output(iter(ROWS), cli_args('pep', 'sqlite'))
+    connection = sqlite3.connect(tmp_path / 'results' / 'results.sqlite3')
+    rows = connection.execute(
+        'SELECT run_id, "Статус", "Количество" FROM pep'
+    ).fetchall()
+    connection.close()
+    assert [row[1:] for row in rows] == ROWS[1:] * 2
+    assert len({row[0] for row in rows}) == 2, (
+        'Запуски в одну секунду должны получать разные идентификаторы'
+    )
+
+
+def test_parquet_output(monkeypatch, tmp_path):
+    import pyarrow.parquet as parquet
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(outputs, 'PARQUET_BATCH_SIZE', 1)
+    outputs.control_output(iter(ROWS), cli_args('pep', 'parquet'))
+    file, = tmp_path.glob('results/pep_*.parquet')
+    assert parquet.read_table(file).to_pylist() == [
+        {'Статус': 'A', 'Количество': 3}, {'Статус': 'F', 'Количество': 5}
+    ], 'Строки из нескольких пакетов должны попадать в один файл parquet'
+
+
 def test_output_file():
     assert hasattr(outputs, 'control_output'), (
         'Напишите функцию `control_output` в модуле `output.py`'
@@ -90,3 +131,17 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_dot_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    outputs.control_output(
+        [('Источник', 'Связь', 'Цель'), (1, 'Superseded-By', 2)],
+        cli_args('pep-graph', 'dot')
+    )
+    assert [
+        file.read_text(encoding='utf-8')
+        for file in tmp_path.glob('results/*.dot')
+    ] == [
+        'digraph "pep-graph" {\n    "1" -> "2" [label="Superseded-By"];\n}\n'
+    ], 'Рёбра графа должны сохраняться в файл формата DOT'
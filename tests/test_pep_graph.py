@@ -0,0 +1,50 @@
+try:
+    from src.pep_graph import PepGraph
+    from src.pep_records import PepRecord
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_graph.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_graph.py`'
+
+
+def make_graph():
+    return PepGraph([
+        PepRecord(1, '', status='Superseded', superseded_by='2'),
+        PepRecord(2, '', status='Superseded'),
+        PepRecord(3, '', status='Final', replaces='2', requires='5, 7'),
+        PepRecord(4, '', status='Rejected', superseded_by='3'),
+        PepRecord(5, '', status='Final'),
+    ])
+
+
+def test_pep_graph_indexes():
+    graph = make_graph()
+    assert graph.edges == [
+        (1, 'Superseded-By', 2),
+        (3, 'Requires', 5),
+        (3, 'Requires', 7),
+        (3, 'Replaces', 2),
+        (4, 'Superseded-By', 3),
+    ]
+    assert graph.reverse['Requires'][5] == {3}
+    assert graph.successors[2] == {3} and graph.predecessors[3] == {2, 4}, (
+        'Поля Replaces и Superseded-By должны давать общие рёбра замен'
+    )
+
+
+def test_pep_graph_queries():
+    graph = make_graph()
+    assert graph.get_superseded(3) == [1, 2, 4], (
+        'Запрос должен возвращать PEP, заменённые через другие PEP'
+    )
+    assert graph.get_superseded(5) == []
+    assert list(graph.get_final_chains()) == [(1, 2, 3), (4, 3)]
+
+
+def test_pep_graph_cycle():
+    graph = PepGraph([
+        PepRecord(1, '', status='Final', superseded_by='2'),
+        PepRecord(2, '', status='Final', superseded_by='1'),
+    ])
+    assert graph.get_superseded(1) == [2]
+    assert list(graph.get_final_chains()) == [(2, 1), (1, 2)]
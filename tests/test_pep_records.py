@@ -0,0 +1,54 @@
+try:
+    from src.pep_records import PepRecord, PepStore
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_records.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_records.py`'
+
+URL = 'https://peps.python.org/pep-{number:04d}/'
+
+
+def make_record(number, status, python_version=''):
+    return PepRecord.from_details(URL.format(number=number), {
+        'Title': f'PEP {number} – Title {number}',
+        'Status': status,
+        'Python-Version': python_version,
+        'Unknown-Field': 'value',
+    })
+
+
+def test_pep_record_from_details():
+    record = make_record(8, 'Active')
+    assert record.number == 8 and record.title == 'Title 8', (
+        'Запись PEP должна хранить номер и название без префикса "PEP N –"'
+    )
+    assert record.as_row()[:4] == (
+        8, URL.format(number=8), 'Title 8', 'Active'
+    )
+    assert not hasattr(record, '__dict__'), (
+        'Класс `PepRecord` должен использовать `__slots__`'
+    )
+
+
+def test_pep_store_filter():
+    store = PepStore()
+    for record in (
+        make_record(701, 'Final', '3.12'),
+        make_record(695, 'Final', '3.12, 3.13'),
+        make_record(649, 'Accepted', '3.14'),
+        make_record(8, 'Active'),
+    ):
+        store.add(record)
+    assert len(store) == 4
+    assert [record.number for record in store.filter()] == [8, 649, 695, 701]
+    assert [
+        record.number for record in store.filter(status=['Final'])
+    ] == [695, 701]
+    assert [
+        record.number for record in store.filter(
+            status=['Final', 'Accepted'], python_version=['3.13', '3.14']
+        )
+    ] == [649, 695], (
+        'Фильтр должен объединять значения одного поля и пересекать поля'
+    )
+    assert store.filter(status=['Draft']) == []
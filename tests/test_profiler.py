@@ -0,0 +1,38 @@
+import time
+
+try:
+    from src.profiler import Profiler
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiler.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiler.py`'
+
+
+def test_profiler_disabled():
+    profiler = Profiler()
+    with profiler.timer('mode'):
+        profiler.count('requests')
+    assert not profiler.calls and not profiler.counters, (
+        'Выключенный профилировщик не должен ничего учитывать'
+    )
+
+
+def test_profiler_nested_stages():
+    profiler = Profiler()
+    profiler.enabled = True
+
+    @profiler.timed('parse')
+    def parse():
+        time.sleep(0.02)
+
+    with profiler.timer('mode'):
+        parse()
+    assert profiler.calls == {'mode': 1, 'parse': 1}
+    assert profiler.times['parse'] >= 0.02
+    assert profiler.times['mode'] < 0.02, (
+        'Время вложенного этапа не должно входить во время внешнего'
+    )
+    rows = list(profiler.timed_iter('mode', iter([1, 2])))
+    assert rows == [1, 2] and profiler.calls['mode'] == 2, (
+        'Все строки результата должны учитываться как один вызов этапа'
+    )
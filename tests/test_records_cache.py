@@ -0,0 +1,70 @@
+import requests
+try:
+    from src.records_cache import RecordsCache
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `records_cache.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `records_cache.py`'
+    )
+
+
+def make_response(url, text, etag):
+    response = requests.Response()
+    response.url = url
+    response._content = text.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.headers['ETag'] = etag
+    return response
+
+
+def test_records_cache_skips_parsing(tmp_path):
+    calls = []
+
+    def extract(text):
+        calls.append(text)
+        return [text.upper()]
+
+    cache = RecordsCache(tmp_path / 'records.sqlite')
+    first = cache.extract(make_response('https://a/', 'pep', '"1"'), extract)
+    second = cache.extract(make_response('https://a/', 'pep', '"1"'), extract)
+    assert first == second == ['PEP']
+    assert len(calls) == 1, (
+        'Запись с тем же url и валидатором должна браться из кеша'
+    )
+    cache.extract(make_response('https://a/', 'new', '"2"'), extract)
+    assert len(calls) == 2, (
+        'Изменившийся валидатор должен приводить к повторному разбору'
+    )
+    cache.close()
+
+
+def test_records_cache_size_limit(tmp_path):
+    cache = RecordsCache(tmp_path / 'records.sqlite', max_size=2)
+    for number in range(5):
+        cache.extract(
+            make_response(f'https://a/{number}', 'pep', '"1"'), list
+        )
+    cache.close()
+    cache = RecordsCache(tmp_path / 'records.sqlite')
+    count, = cache.connection.execute(
+        'SELECT COUNT(*) FROM records'
+    ).fetchone()
+    cache.close()
+    assert count == 2, 'Кеш записей должен ограничиваться `max_size`'
+
+
+def test_records_cache_concurrent_runs(tmp_path):
+    first = RecordsCache(tmp_path / 'records.sqlite', timeout=0.1)
+    first.extract(make_response('https://a/', 'pep', '"1"'), list)
+    second = RecordsCache(tmp_path / 'records.sqlite', timeout=0.1)
+    assert second.get(
+        second.get_key(make_response('https://a/', 'pep', '"1"'), list)
+    ) == (True, ['p', 'e', 'p']), (
+        'Записи должны сохраняться сразу и не блокировать другие запуски'
+    )
+    second.extract(make_response('https://a/2', 'pep', '"1"'), list)
+    first.close()
+    second.close()
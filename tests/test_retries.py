@@ -0,0 +1,145 @@
+import time
+
+import pytest
+import requests
+import requests_mock
+try:
+    from src import utils
+    from src.retries import CircuitBreaker
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `retries.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `retries.py`'
+
+URL = 'https://peps.python.org/pep-0008/'
+
+
+def test_get_response_retries(monkeypatch):
+    monkeypatch.setattr(utils, 'get_backoff', lambda attempt: 0)
+    session = requests.Session()
+    session.retries = 2
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(URL, [
+            {'exc': requests.exceptions.ConnectTimeout},
+            {'status_code': 502},
+            {'text': 'PEP 8'},
+        ])
+        assert utils.get_response(session, URL).text == 'PEP 8', (
+            'Временные ошибки загрузки должны повторяться'
+        )
+
+
+def test_get_pages_retries_failed(monkeypatch):
+    session = requests.Session()
+    session.retries = 0
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(URL, [
+            {'exc': requests.exceptions.ConnectionError},
+            {'text': 'PEP 8'},
+        ])
+        url, response, error = next(utils.get_pages(session, [URL]))
+    assert error is None and response.text == 'PEP 8', (
+        'Страницы с ошибками должны загружаться повторно в конце'
+    )
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failures=2, reset_after=60)
+    breaker.failure('peps.python.org')
+    breaker.check('peps.python.org')
+    breaker.failure('peps.python.org')
+    with pytest.raises(ConnectionError) as excinfo:
+        breaker.check('peps.python.org')
+    assert excinfo.typename == 'HostUnavailableException', (
+        'После серии ошибок запросы к хосту должны прерываться'
+    )
+    breaker.check('docs.python.org')
+
+
+def get_breaker_session(failures, reset_after, responses):
+    session = requests.Session()
+    session.retries = 0
+    session.circuit_breaker = CircuitBreaker(failures, reset_after)
+    adapter = requests_mock.Adapter()
+    for url, url_responses in responses.items():
+        adapter.register_uri('GET', url, url_responses)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_pep_urls(count):
+    return [f'https://peps.python.org/pep-{number:04d}/' for number in range(
+        count
+    )]
+
+
+def test_breaker_pages_are_retried_after_reset():
+    urls = get_pep_urls(20)
+    outage_end = time.monotonic() + 0.1
+
+    def get_text(request, context):
+        if time.monotonic() < outage_end:
+            raise requests.exceptions.ConnectionError
+        return request.url
+
+    session = get_breaker_session(
+        3, 0.2, {url: [{'text': get_text}] for url in urls}
+    )
+    pages = {
+        url: (response, error) for url, response, error in utils.get_pages(
+            session, urls, workers=4
+        )
+    }
+    assert sorted(pages) == urls
+    assert all(
+        error is None and response.text == url
+        for url, (response, error) in pages.items()
+    ), (
+        'Страницы, отклонённые разомкнутой цепью после кратковременного '
+        'сбоя, должны загружаться повторно в конце'
+    )
+
+
+def test_breaker_host_down_fails_the_run():
+    urls = get_pep_urls(10)
+    session = get_breaker_session(3, 0.05, {
+        url: [{'exc': requests.exceptions.ConnectionError}] for url in urls
+    })
+    with pytest.raises(ConnectionError) as excinfo:
+        list(utils.get_pages(session, urls, workers=2))
+    assert excinfo.typename == 'HostUnavailableException', (
+        'Если хост остаётся недоступным, режим должен завершаться ошибкой, '
+        'а не выводить результаты по части страниц'
+    )
+
+
+def test_throttling_does_not_open_breaker():
+    urls = get_pep_urls(3)
+    session = get_breaker_session(1, 60, {
+        urls[0]: [{'status_code': 429}],
+        urls[1]: [{'status_code': 503}],
+        urls[2]: [{'text': 'PEP 2'}],
+    })
+    errors = [
+        type(error).__name__ for url, response, error in utils.get_pages(
+            session, urls, workers=1
+        ) if error is not None
+    ]
+    assert errors == ['ThrottledException', 'ThrottledException']
+    assert not session.circuit_breaker.opened, (
+        'Ответы 429/503 означают ограничение частоты, а не недоступный хост'
+    )
+
+
+def test_throttled_page_is_not_retried(monkeypatch):
+    monkeypatch.setattr(utils, 'get_backoff', lambda attempt: 0)
+    session = requests.Session()
+    session.retries = 3
+    with requests_mock.Mocker(session=session) as mock:
+        mock.get(URL, status_code=503)
+        url, response, error = next(utils.get_pages(session, [URL]))
+    assert type(error).__name__ == 'ThrottledException'
+    assert mock.call_count == 1, (
+        'Ответы 429/503 повторяет транспорт, get_response и get_pages '
+        'не должны повторять их ещё раз'
+    )
@@ -0,0 +1,55 @@
+from argparse import Namespace
+try:
+    from src.server import ParserServer
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+def test_parser_server_keeps_results(mock_session):
+    calls = []
+
+    def pep(session, cli_args=None):
+        calls.append(session)
+        yield 'Статус', 'Количество'
+        yield 'F', 1
+
+    server = ParserServer(mock_session, Namespace(), {'pep': pep})
+    first = server.get('pep')
+    second = server.get('pep')
+    assert first['results'] == [{'Статус': 'F', 'Количество': 1}]
+    assert first is second and len(calls) == 1, (
+        'Повторный запрос должен отдавать результаты из памяти'
+    )
+    server.get('pep', refresh=True)
+    assert len(calls) == 2, 'Обновление должно заново выполнять режим'
+
+
+def test_parser_server_without_background_refresh(mock_session):
+    server = ParserServer(mock_session, Namespace(), {}, refresh=0)
+    server.refresh_results()
+    assert not server.stopped.is_set(), (
+        'При `--refresh 0` фоновое обновление не должно запускаться'
+    )
+
+
+def test_serve_skips_download(monkeypatch):
+    import server
+    from src import main
+    served = {}
+    monkeypatch.setattr(
+        server, 'serve', lambda session, args, modes: served.update(modes)
+    )
+
+    class Session:
+        records_cache = type('Cache', (), {'close': lambda self: None})()
+        snapshot = None
+
+    monkeypatch.setattr(main, 'configure_session', lambda args: Session)
+    main.run_parser(
+        Namespace(mode='serve', profile=False, profile_json=False), None
+    )
+    assert served and 'download' not in served, (
+        'Режим serve не должен отдавать режим download'
+    )
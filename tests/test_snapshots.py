@@ -0,0 +1,67 @@
+import requests
+import requests_mock
+try:
+    from src.snapshots import SnapshotAdapter, SnapshotWriter
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshots.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshots.py`'
+
+PEP_URL = 'https://peps.python.org/'
+
+
+def test_snapshot_record_replay(tmp_path):
+    writer = SnapshotWriter(tmp_path)
+    with requests_mock.Mocker() as mock:
+        for number in range(3):
+            url = f'{PEP_URL}pep-{number:04d}/'
+            mock.get(url, text='PEP', headers={'ETag': f'"{number}"'})
+            writer.add(url, requests.get(url))
+    writer.close()
+    assert len(writer.index['blobs']) == 1, (
+        'Одинаковые тела ответов должны храниться в снимке один раз'
+    )
+    session = requests.Session()
+    session.mount('https://', SnapshotAdapter(tmp_path))
+    response = session.get(f'{PEP_URL}pep-0002/')
+    assert response.text == 'PEP' and response.headers['ETag'] == '"2"'
+    try:
+        session.get(f'{PEP_URL}pep-0003/')
+    except requests.exceptions.ConnectionError:
+        pass
+    else:
+        assert False, 'Отсутствующая в снимке страница должна давать ошибку'
+
+
+def test_replay_partial_snapshot(monkeypatch, tmp_path):
+    from src import configs, main
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    numbers = range(30)
+    missing = 12
+    writer = SnapshotWriter(tmp_path / 'snapshot')
+    writer.add_body('GET', PEP_URL, 200, {}, ''.join(
+        '<tr class="row-odd"><td><abbr>SF</abbr></td>'
+        f'<td><a class="pep reference internal" href="pep-{number:04d}/">'
+        f'{number}</a></td></tr>'
+        for number in numbers
+    ).join(('<html><body><table>', '</table></body></html>')).encode())
+    for number in numbers[missing:]:
+        writer.add_body(
+            'GET', f'{PEP_URL}pep-{number:04d}/', 200, {},
+            b'<html><body><dl class="rfc2822 field-list simple">'
+            b'<dt>Status<span>:</span></dt><dd><abbr>Final</abbr></dd>'
+            b'</dl></body></html>'
+        )
+    writer.close()
+    cli_args = configs.configure_argument_parser(
+        main.MODE_TO_FUNCTION
+    ).parse_args(['pep', '--replay', str(tmp_path / 'snapshot')])
+    session = configs.configure_session(cli_args)
+    try:
+        results = list(main.pep(session, cli_args))
+    finally:
+        session.records_cache.close()
+    assert results[-1] == ('Всего', len(numbers) - missing), (
+        'Страницы, отсутствующие в снимке, не должны мешать загрузке '
+        'остальных страниц снимка'
+    )
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+from conftest import SRC_DIR
+
+HEAVY_MODULES = (
+    'asyncio', 'bs4', 'lxml', 'multiprocessing', 'prettytable', 'requests',
+    'requests_cache', 'sqlite3', 'tqdm'
+)
+
+
+def get_imported_modules(*args):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return {
+        line.split('|')[-1].strip() for line in result.stderr.splitlines()
+        if line.startswith('import time:')
+    }
+
+
+def test_help_startup_imports():
+    modules = get_imported_modules('main.py', '--help')
+    loaded = [module for module in HEAVY_MODULES if module in modules]
+    assert not loaded, (
+        'Справка парсера не должна загружать тяжёлые модули, '
+        f'загружены: {", ".join(loaded)}. Импортируйте их там, где они '
+        'используются'
+    )
+
+
+def test_lxml_engine_does_not_import_bs4():
+    modules = get_imported_modules(
+        '-c',
+        'import extractors; '
+        'extractors.lxml_pep_status("<html><body></body></html>")'
+    )
+    assert 'bs4' not in modules, (
+        'Движок lxml не должен загружать bs4'
+    )
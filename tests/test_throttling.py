@@ -0,0 +1,71 @@
+import io
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    from src.throttling import HostLimiter, ThrottlingAdapter
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO()
+    response.headers.update(headers or {})
+    return response
+
+
+def test_host_limiter_aimd():
+    limiter = HostLimiter(rate=0, max_workers=4)
+    start_limit = limiter.limit
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.1, 200)
+    assert limiter.limit == 4, (
+        'Параллельность должна расти до `max_workers` при быстрых ответах'
+    )
+    limiter.acquire()
+    limiter.release(0.1, 429)
+    assert limiter.limit == 2 < start_limit + 2, (
+        'Ответ 429 должен уменьшать параллельность'
+    )
+
+
+def test_throttling_adapter_honors_retry_after(monkeypatch):
+    responses = [
+        make_response(429, {'Retry-After': '0.2'}), make_response(200)
+    ]
+    monkeypatch.setattr(
+        HTTPAdapter, 'send', lambda self, request, **kwargs: responses.pop(0)
+    )
+    adapter = ThrottlingAdapter(rate=0)
+    request = requests.Request('GET', 'https://peps.python.org/').prepare()
+    start = time.monotonic()
+    response = adapter.send(request)
+    assert response.status_code == 200, (
+        'Запрос, получивший 429, должен быть повторён'
+    )
+    assert time.monotonic() - start >= 0.2, (
+        'Повторный запрос должен ждать время из заголовка Retry-After'
+    )
+
+
+def test_throttling_adapter_default_timeout(monkeypatch):
+    timeouts = []
+
+    def send(self, request, **kwargs):
+        timeouts.append(kwargs['timeout'])
+        return make_response(200)
+
+    monkeypatch.setattr(HTTPAdapter, 'send', send)
+    adapter = ThrottlingAdapter(rate=0, timeout=(5, 30))
+    request = requests.Request('GET', 'https://peps.python.org/').prepare()
+    adapter.send(request, timeout=None)
+    adapter.send(request, timeout=1)
+    assert timeouts == [(5, 30), 1], (
+        'Таймаут по умолчанию должен использоваться, если он не указан'
+    )
@@ -54,3 +54,198 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-3.13-docs-pdf-a4.zip'
+
+
+def download_session(get_responses):
+    from requests_cache import CachedSession
+    session = CachedSession(backend='memory')
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('HEAD', ARCHIVE_URL, headers={
+        'Content-Length': '6', 'ETag': '"v1"'
+    })
+    adapter.register_uri('GET', ARCHIVE_URL, get_responses)
+    session.mount('https://', adapter)
+    return session, adapter
+
+
+def test_download_file_skip_downloaded(tmp_path):
+    session, adapter = download_session([{'content': b'abcdef'}])
+    path = tmp_path / 'docs.zip'
+    path.write_bytes(b'abcdef')
+    (tmp_path / 'docs.zip.etag').write_text('"v1"')
+    assert utils.download_file(session, ARCHIVE_URL, path) is False, (
+        'Архив с тем же ETag не должен загружаться повторно'
+    )
+    assert [request.method for request in adapter.request_history] == [
+        'HEAD'
+    ]
+
+
+@pytest.mark.parametrize('status_code, content, expected', [
+    (206, b'def', b'abcdef'),
+    (200, b'abcdef', b'abcdef'),
+])
+def test_download_file_resume(tmp_path, status_code, content, expected):
+    session, adapter = download_session([
+        {'status_code': status_code, 'content': content}
+    ])
+    path = tmp_path / 'docs.zip'
+    (tmp_path / 'docs.zip.part').write_bytes(b'abc')
+    assert utils.download_file(session, ARCHIVE_URL, path) is True
+    request = adapter.request_history[-1]
+    assert request.headers['Range'] == 'bytes=3-'
+    assert request.headers['If-Range'] == '"v1"'
+    assert path.read_bytes() == expected, (
+        'Ответ 206 должен дописываться к `.part`, а ответ 200 - заменять его'
+    )
+    assert not (tmp_path / 'docs.zip.part').exists()
+    assert (tmp_path / 'docs.zip.etag').read_text() == '"v1"'
+
+
+def test_download_file_bypasses_cache(tmp_path):
+    session, _ = download_session([{'content': b'abcdef'}])
+    utils.download_file(session, ARCHIVE_URL, tmp_path / 'docs.zip')
+    assert list(session.cache.responses.keys()) == [], (
+        'Архивы и HEAD-запросы не должны сохраняться в кеш HTTP-запросов'
+    )
+
+
+def test_run_pages_completion_order_and_errors():
+    import time
+
+    def slow(request, context):
+        time.sleep(0.2)
+        return 'slow'
+
+    session = requests.Session()
+    session.retries = 0
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', 'https://a.org/slow', text=slow)
+    adapter.register_uri('GET', 'https://a.org/fast', text='fast')
+    adapter.register_uri(
+        'GET', 'https://a.org/broken', exc=requests.exceptions.ConnectTimeout
+    )
+    session.mount('https://', adapter)
+    pages = list(utils.run_pages(
+        session,
+        ['https://a.org/slow', 'https://a.org/fast', 'https://a.org/broken'],
+        workers=3
+    ))
+    assert [url for url, _, _ in pages][-1] == 'https://a.org/slow', (
+        'Страницы должны отдаваться в порядке завершения загрузки'
+    )
+    errors = {url: error for url, _, error in pages}
+    assert errors['https://a.org/fast'] is None
+    assert isinstance(errors['https://a.org/broken'], ConnectionError), (
+        'Ошибка загрузки должна возвращаться в кортеже страницы'
+    )
+
+
+def test_fetch_pages_host_limit(monkeypatch):
+    import threading
+    import time
+    monkeypatch.setattr(utils, 'HOST_WORKERS', 2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def page(request, context):
+        with lock:
+            active.append(request.url)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(request.url)
+        return '<html><body><h1>PEP</h1></body></html>'
+
+    session = requests.Session()
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', requests_mock.ANY, text=page)
+    session.mount('https://', adapter)
+    urls = [f'https://a.org/{number}' for number in range(6)]
+    soups = list(utils.get_soups(session, urls, workers=6))
+    assert sorted(url for url, _, _ in soups) == sorted(urls)
+    assert all(soup.h1.text == 'PEP' for _, soup, _ in soups), (
+        'Функция `get_soups` должна возвращать разобранные страницы'
+    )
+    assert max(peak) == 2, (
+        'К одному хосту не должно выполняться больше `HOST_WORKERS` запросов'
+    )
+
+
+def test_extract_pages_processes(tmp_path):
+    from src.extractors import bs4_pep_status
+    from src.records_cache import RecordsCache
+    statuses = ('Final', 'Draft', 'Active', 'Rejected')
+    urls = [f'https://a.org/pep-{number}/' for number in range(len(statuses))]
+    session = requests.Session()
+    session.retries = 0
+    adapter = requests_mock.Adapter()
+    for url, status in zip(urls, statuses):
+        adapter.register_uri('GET', url, text=(
+            '<html><body><dl class="rfc2822 field-list simple">'
+            f'<dt>Status<span>:</span></dt><dd><abbr>{status}</abbr></dd>'
+            '</dl></body></html>'
+        ))
+    adapter.register_uri(
+        'GET', 'https://a.org/broken', exc=requests.exceptions.ConnectTimeout
+    )
+    session.mount('https://', adapter)
+
+    def extract(processes):
+        return {
+            url: (record, None if error is None else type(error).__name__)
+            for url, record, error in utils.extract_pages(
+                session,
+                [*urls, 'https://a.org/broken'],
+                bs4_pep_status,
+                workers=2,
+                processes=processes
+            )
+        }
+
+    expected = extract(1)
+    assert expected['https://a.org/broken'] == (None, 'ConnectionError')
+    session.records_cache = RecordsCache(tmp_path / 'records')
+    assert extract(2) == expected, (
+        'Разбор страниц в пуле процессов должен давать те же записи и '
+        'ошибки, что и в одном процессе'
+    )
+    assert session.records_cache.connection.execute(
+        'SELECT COUNT(*) FROM records'
+    ).fetchone()[0] == len(urls), (
+        'Записи, разобранные в пуле процессов, должны сохраняться в кеш'
+    )
+    session.records_cache.set(session.records_cache.get_key(
+        utils.get_response(session, urls[0]), bs4_pep_status
+    ), 'Cached')
+    assert extract(2)[urls[0]] == ('Cached', None), (
+        'Записи из кеша не должны разбираться в пуле процессов заново'
+    )
+    session.records_cache.close()
+
+
+def test_get_soups_encoding():
+    session = requests.Session()
+    adapter = requests_mock.Adapter()
+    adapter.register_uri(
+        'GET',
+        requests_mock.ANY,
+        content='<html><body><h1>Что нового</h1></body></html>'.encode(
+            'cp1251'
+        )
+    )
+    session.mount('https://', adapter)
+    urls = [f'https://a.org/{number}' for number in range(3)]
+    soups = list(utils.get_soups(session, urls, encoding='cp1251'))
+    assert [soup.h1.text for _, soup, _ in soups] == ['Что нового'] * 3, (
+        'Пакетная загрузка должна декодировать страницы в переданной '
+        'кодировке'
+    )
+    url, response, error = next(utils.get_pages(session, urls[:1]))
+    assert response.encoding == 'utf-8', (
+        'По умолчанию страницы должны декодироваться как utf-8'
+    )